@@ -1,18 +1,35 @@
 # -*- mode: python ; coding: utf-8 -*-
+# Build with `python build_executable.py` (or `pyinstaller Resolut.spec`).
+import os
+import sys
+
+ROOT = os.path.abspath(SPECPATH)
+
+# Stdlib/dev modules the app never imports at runtime
+EXCLUDES = [
+    'tkinter', 'unittest', 'pydoc', 'test', 'lib2to3',
+    'pytest', 'IPython', 'matplotlib',
+]
+
+# strip(1) is not available for Windows DLLs
+STRIP = sys.platform != 'win32'
+
+# UPX corrupts the MSVC runtime and some Qt DLLs
+UPX_EXCLUDE = ['vcruntime140.dll', 'vcruntime140_1.dll', 'Qt6*.dll']
 
 
 a = Analysis(
-    ['C:\\Users\\shamg\\OneDrive\\Documents\\encode-hackathon\\Resolut-Personal-Learning-Assistance\\Resolut---Personal-Learning-Assistance\\overlay\\scroll_monitor_main.py'],
-    pathex=['C:\\Users\\shamg\\OneDrive\\Documents\\encode-hackathon\\Resolut-Personal-Learning-Assistance\\Resolut---Personal-Learning-Assistance'],
+    [os.path.join(ROOT, 'overlay', 'scroll_monitor_main.py')],
+    pathex=[ROOT],
     binaries=[],
-    datas=[('C:\\Users\\shamg\\OneDrive\\Documents\\encode-hackathon\\Resolut-Personal-Learning-Assistance\\Resolut---Personal-Learning-Assistance\\app', 'app'), ('C:\\Users\\shamg\\OneDrive\\Documents\\encode-hackathon\\Resolut-Personal-Learning-Assistance\\Resolut---Personal-Learning-Assistance\\overlay', 'overlay')],
+    datas=[(os.path.join(ROOT, 'app'), 'app'), (os.path.join(ROOT, 'overlay'), 'overlay')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
-    optimize=0,
+    optimize=1,
 )
 pyz = PYZ(a.pure)
 
@@ -24,8 +41,9 @@ exe = EXE(
     name='Resolut',
     debug=False,
     bootloader_ignore_signals=False,
-    strip=False,
+    strip=STRIP,
     upx=True,
+    upx_exclude=UPX_EXCLUDE,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -37,8 +55,8 @@ coll = COLLECT(
     exe,
     a.binaries,
     a.datas,
-    strip=False,
+    strip=STRIP,
     upx=True,
-    upx_exclude=[],
+    upx_exclude=UPX_EXCLUDE,
     name='Resolut',
 )
@@ -18,6 +18,7 @@ PRIVACY:
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 import sys
@@ -32,7 +33,7 @@ from agents.teaching_agent.teaching_inference import run_teaching_agent
 from agents.scheduling_agent.scheduling_inference import run_scheduling_agent
 from tool_client import create_tool_client
 
-app = FastAPI(title="Resolut AI Service")
+app = FastAPI(title="Resolut AI Service", default_response_class=ORJSONResponse)
 
 # Enable CORS
 # Note: When allow_credentials=True, allow_origins cannot be ["*"]
@@ -0,0 +1,97 @@
+"""
+Resolut Desktop Backend Launcher
+
+Serves the Local Service (port 8000) and the AI Service (port 8001) from a
+single Python process, so the heavy imports (torch, sentence-transformers,
+langchain, ...) are paid for once instead of once per uvicorn process.
+Each service keeps its own thread and event loop: the AI Service runs its
+agents synchronously inside its handlers, and that must not stall the
+Local Service.
+
+Run with app/backend/local_service as the working directory: the Local
+Service resolves its data/ and uploads/ paths relative to it.
+"""
+
+import argparse
+import importlib.util
+import sys
+import threading
+from pathlib import Path
+
+import uvicorn
+
+BACKEND_DIR = Path(__file__).resolve().parent
+
+
+def load_service_app(folder: str, module_name: str):
+    """
+    Import <folder>/main.py under a unique module name and return its app.
+
+    Both services call their entry module `main`, so they cannot share the
+    usual import path; each service folder is put on sys.path for its own
+    sibling imports (rag, agents, tool_client, ...).
+    """
+    service_dir = BACKEND_DIR / folder
+    sys.path.insert(0, str(service_dir))
+    spec = importlib.util.spec_from_file_location(module_name, service_dir / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def serve_all(configs):
+    """Run each uvicorn server on its own thread/loop; stop all when one stops."""
+    servers = [uvicorn.Server(config) for config in configs]
+    main_server, others = servers[0], servers[1:]
+
+    def run_secondary(server):
+        server.run()
+        main_server.should_exit = True
+
+    threads = [
+        threading.Thread(target=run_secondary, args=(server,),
+                         name=f"uvicorn-{server.config.port}", daemon=True)
+        for server in others
+    ]
+    for thread in threads:
+        thread.start()
+    # uvicorn only installs its SIGINT/SIGTERM handlers on the main thread,
+    # so the first server runs here and shuts the others down when it exits
+    try:
+        main_server.run()
+    finally:
+        for server in others:
+            server.should_exit = True
+        for thread in threads:
+            thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--local-port", type=int, default=8000)
+    parser.add_argument("--ai-port", type=int, default=8001)
+    # Already-listening sockets inherited from the desktop launcher
+    parser.add_argument("--local-fd", type=int)
+    parser.add_argument("--ai-fd", type=int)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--no-access-log", action="store_true")
+    args = parser.parse_args()
+
+    local_app = load_service_app("local_service", "local_service_main")
+    ai_app = load_service_app("ai_service", "ai_service_main")
+
+    configs = [
+        uvicorn.Config(app, host=args.host, port=port, fd=fd,
+                       log_level=args.log_level, access_log=not args.no_access_log)
+        for app, port, fd in (
+            (local_app, args.local_port, args.local_fd),
+            (ai_app, args.ai_port, args.ai_fd),
+        )
+    ]
+    serve_all(configs)
+
+
+if __name__ == "__main__":
+    main()
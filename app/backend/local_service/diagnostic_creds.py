@@ -1,5 +1,5 @@
 import os
-import json
+import orjson
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -36,8 +36,8 @@ def run_diagnostic():
     
     if credentials_path.exists():
         try:
-            with open(credentials_path, 'r') as f:
-                creds = json.load(f)
+            with open(credentials_path, 'rb') as f:
+                creds = orjson.loads(f.read())
                 has_installed = "installed" in creds
                 print(f"Valid format ('installed' key): {has_installed}")
         except Exception as e:
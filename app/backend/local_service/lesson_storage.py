@@ -1,16 +1,22 @@
 """
 Local Lesson Storage & Progress Tracking
 """
-import json
+import orjson
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 DATA_DIR = Path("data")
 LESSONS_DIR = DATA_DIR / "lessons"
 PROGRESS_FILE = DATA_DIR / "progress.json"
 
+# Maximum number of parsed lessons kept in memory
+LESSON_CACHE_SIZE = 512
+
 class LessonContent(BaseModel):
+    model_config = ConfigDict(extra='ignore', validate_assignment=False)
+
     topic: str
     chapter: str
     lesson_title: str
@@ -22,11 +28,20 @@ class TopicProgress(BaseModel):
     current_lesson: str
     completed_lessons: List[str]  # List of "Chapter Name: Lesson Name"
 
+# Parsed lesson content keyed by lesson file path (LRU order)
+_content_cache: "OrderedDict[Path, LessonContent]" = OrderedDict()
+
+def _cache_lesson(path: Path, content: LessonContent):
+    _content_cache[path] = content
+    _content_cache.move_to_end(path)
+    if len(_content_cache) > LESSON_CACHE_SIZE:
+        _content_cache.popitem(last=False)
+
 def _ensure_dirs():
     LESSONS_DIR.mkdir(parents=True, exist_ok=True)
     if not PROGRESS_FILE.exists():
-        with open(PROGRESS_FILE, "w") as f:
-            json.dump({}, f)
+        with open(PROGRESS_FILE, "wb") as f:
+            f.write(orjson.dumps({}))
 
 def _get_lesson_path(topic: str, chapter: str, lesson: str) -> Path:
     safe_topic = "".join(c for c in topic if c.isalnum() or c in (' ', '_', '-')).strip()
@@ -39,34 +54,51 @@ def save_lesson_content(content: LessonContent):
     path = _get_lesson_path(content.topic, content.chapter, content.lesson_title)
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        f.write(content.json())
+        f.write(content.model_dump_json())
+    _cache_lesson(path, content)
 
 def get_lesson_content(topic: str, chapter: str, lesson: str) -> Optional[LessonContent]:
     path = _get_lesson_path(topic, chapter, lesson)
+    cached = _content_cache.get(path)
+    if cached is not None:
+        _content_cache.move_to_end(path)
+        return cached
     if not path.exists():
         return None
     try:
         with open(path, "r", encoding="utf-8") as f:
-            return LessonContent.parse_raw(f.read())
+            content = LessonContent.model_validate_json(f.read())
     except Exception:
         return None
+    _cache_lesson(path, content)
+    return content
 
 def get_progress(topic: str) -> Optional[TopicProgress]:
     _ensure_dirs()
     try:
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            all_progress = json.load(f)
+        with open(PROGRESS_FILE, "rb") as f:
+            all_progress = orjson.loads(f.read())
             if topic in all_progress:
                 return TopicProgress.parse_obj(all_progress[topic])
     except Exception:
         pass
     return None
 
+def get_total_completed() -> int:
+    """Number of completed lessons across every topic."""
+    _ensure_dirs()
+    try:
+        with open(PROGRESS_FILE, "rb") as f:
+            all_progress = orjson.loads(f.read())
+    except Exception:
+        return 0
+    return sum(len(p.get("completed_lessons", [])) for p in all_progress.values())
+
 def init_progress(topic: str, first_chapter: str, first_lesson: str):
     _ensure_dirs()
     try:
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            all_progress = json.load(f)
+        with open(PROGRESS_FILE, "rb") as f:
+            all_progress = orjson.loads(f.read())
     except Exception:
         all_progress = {}
     
@@ -77,16 +109,16 @@ def init_progress(topic: str, first_chapter: str, first_lesson: str):
             completed_lessons=[]
         )
         all_progress[topic] = new_progress.dict()
-        with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(all_progress, f, indent=2)
+        with open(PROGRESS_FILE, "wb") as f:
+            f.write(orjson.dumps(all_progress, option=orjson.OPT_INDENT_2))
 
 def update_progress(topic: str, next_chapter: str, next_lesson: str, completed_lesson_id: str):
     _ensure_dirs()
     try:
-        with open(PROGRESS_FILE, "r", encoding="utf-8") as f:
-            all_progress = json.load(f)
+        with open(PROGRESS_FILE, "rb") as f:
+            all_progress = orjson.loads(f.read())
     except Exception:
-        ordered_dict = {}
+        all_progress = {}
         
     if topic in all_progress:
         progress = all_progress[topic]
@@ -96,5 +128,5 @@ def update_progress(topic: str, next_chapter: str, next_lesson: str, completed_l
         progress["current_chapter"] = next_chapter
         progress["current_lesson"] = next_lesson
         
-        with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(all_progress, f, indent=2)
+        with open(PROGRESS_FILE, "wb") as f:
+            f.write(orjson.dumps(all_progress, option=orjson.OPT_INDENT_2))
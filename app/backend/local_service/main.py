@@ -12,13 +12,20 @@ The AI agent only receives retrieved text chunks, never raw files.
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import os
-import shutil
 import httpx
+import aiohttp
+import aiofiles
+import asyncio
 from pathlib import Path
-import json
+import orjson
+import ciso8601
+import re
+import time
 import datetime
 from dotenv import load_dotenv
 
@@ -44,7 +51,7 @@ try:
     from .roadmap_storage import save_roadmap, get_roadmap, delete_roadmap, _load_roadmaps
     from .lesson_storage import (
         save_lesson_content, get_lesson_content, get_progress, 
-        init_progress, update_progress
+        init_progress, update_progress, get_total_completed, LessonContent
     )
     from .calendar_service import (
         is_connected, list_events, create_event, 
@@ -56,14 +63,47 @@ except ImportError:
     from roadmap_storage import save_roadmap, get_roadmap, delete_roadmap, _load_roadmaps
     from lesson_storage import (
         save_lesson_content, get_lesson_content, get_progress, 
-        init_progress, update_progress
+        init_progress, update_progress, get_total_completed, LessonContent
     )
     from calendar_service import (
         is_connected, list_events, create_event, 
         get_calendar_service, get_free_slots, CREDENTIALS_PATH, CALENDAR_DATA_DIR
     )
 
-app = FastAPI(title="Resolut Local Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up shared resources on service startup and release them on shutdown."""
+    # One pooled client for all calls to the AI service, so connections are
+    # kept alive instead of re-handshaking on every request
+    app.state.http_client = httpx.AsyncClient(
+        timeout=120.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    # aiohttp session for the hot lesson-generation path (start_lesson),
+    # which fans many concurrent students out to the AI service
+    app.state.aio_session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=60),
+        timeout=aiohttp.ClientTimeout(total=120)
+    )
+    
+    # This will load or create the FAISS index
+    get_indexer(data_dir="data")
+    print("Local RAG indexer initialized")
+    
+    # Trigger scheduling in the background
+    asyncio.create_task(trigger_autonomous_scheduling(is_manual=False))
+    
+    yield
+    
+    await app.state.http_client.aclose()
+    await app.state.aio_session.close()
+
+
+app = FastAPI(
+    title="Resolut Local Service",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # Enable CORS for frontend communication
 # Note: When allow_credentials=True, allow_origins cannot be ["*"]
@@ -85,16 +125,17 @@ app.add_middleware(
 AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://127.0.0.1:8001")
 LOCAL_SERVICE_URL = os.getenv("LOCAL_SERVICE_URL", "http://127.0.0.1:8000")
 
-# Initialize indexer on startup
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the RAG indexer and trigger scheduling on service startup."""
-    # This will load or create the FAISS index
-    get_indexer(data_dir="data")
-    print("Local RAG indexer initialized")
-    
-    # Trigger scheduling in the background
-    asyncio.create_task(trigger_autonomous_scheduling(is_manual=False))
+# Payloads to the AI service are pre-serialized with orjson
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Directories already created by this process
+_ensured: set = set()
+
+def _ensure_dir(p: Path):
+    """mkdir -p, skipping the syscall for directories created earlier."""
+    if p not in _ensured:
+        p.mkdir(parents=True, exist_ok=True)
+        _ensured.add(p)
 
 
 # =============================================================================
@@ -131,21 +172,39 @@ class SchedulingSettings(BaseModel):
 
 SCHEDULING_SETTINGS_FILE = CALENDAR_DATA_DIR / "scheduling_settings.json"
 
+# (mtime_ns, settings) of the last parsed settings file
+_settings_cache: Optional[Tuple[int, SchedulingSettings]] = None
+
 def load_scheduling_settings() -> SchedulingSettings:
-    if SCHEDULING_SETTINGS_FILE.exists():
-        try:
-            with open(SCHEDULING_SETTINGS_FILE, 'r') as f:
-                data = json.load(f)
-                return SchedulingSettings(**data)
-        except Exception as e:
-            print(f"Error loading settings: {e}")
-    return SchedulingSettings()
+    """Load scheduling settings, re-parsing the file only when its mtime changes."""
+    global _settings_cache
+    try:
+        mtime = SCHEDULING_SETTINGS_FILE.stat().st_mtime_ns
+    except OSError:
+        return SchedulingSettings()
+    
+    if _settings_cache is not None and _settings_cache[0] == mtime:
+        return _settings_cache[1].model_copy()
+    
+    try:
+        with open(SCHEDULING_SETTINGS_FILE, 'rb') as f:
+            data = orjson.loads(f.read())
+            settings = SchedulingSettings(**data)
+    except Exception as e:
+        print(f"Error loading settings: {e}")
+        return SchedulingSettings()
+    
+    _settings_cache = (mtime, settings)
+    return settings.model_copy()
 
 def save_scheduling_settings(settings: SchedulingSettings):
+    global _settings_cache
     try:
-        CALENDAR_DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(SCHEDULING_SETTINGS_FILE, 'w') as f:
-            json.dump(settings.dict(), f)
+        _ensure_dir(CALENDAR_DATA_DIR)
+        with open(SCHEDULING_SETTINGS_FILE, 'wb') as f:
+            f.write(orjson.dumps(settings.model_dump()))
+        # Readers see the new value without re-parsing the file
+        _settings_cache = (SCHEDULING_SETTINGS_FILE.stat().st_mtime_ns, settings.model_copy())
     except Exception as e:
         print(f"Error saving settings: {e}")
 
@@ -188,6 +247,52 @@ async def tool_index_stats():
 # Google Calendar Endpoints
 # =============================================================================
 
+# Seconds a calendar connection / credentials-file check is reused
+CALENDAR_STATUS_TTL = 5.0
+
+# Environment is fixed once .env has been loaded above
+_HAS_ENV_CREDS = bool(os.getenv("GOOGLE_CALENDAR_CLIENT_ID") and os.getenv("GOOGLE_CALENDAR_CLIENT_SECRET"))
+
+_conn_cache = {"t": 0.0, "v": False}
+_creds_file_cache = {"t": 0.0, "v": False}
+
+def is_connected_cached() -> bool:
+    """is_connected(), re-checked at most every CALENDAR_STATUS_TTL seconds."""
+    now = time.monotonic()
+    if now - _conn_cache["t"] > CALENDAR_STATUS_TTL:
+        _conn_cache["v"] = bool(is_connected())
+        _conn_cache["t"] = now
+    return _conn_cache["v"]
+
+def credentials_file_exists() -> bool:
+    """CREDENTIALS_PATH.exists(), re-checked at most every CALENDAR_STATUS_TTL seconds."""
+    now = time.monotonic()
+    if now - _creds_file_cache["t"] > CALENDAR_STATUS_TTL:
+        _creds_file_cache["v"] = CREDENTIALS_PATH.exists()
+        _creds_file_cache["t"] = now
+    return _creds_file_cache["v"]
+
+# Seconds fetched calendar events are reused (the UI polls more often than they change)
+EVENTS_CACHE_TTL = 30.0
+
+# max_results -> (fetched_at, events)
+_events_cache: Dict[int, Tuple[float, List[Dict[str, Any]]]] = {}
+_events_lock = asyncio.Lock()
+
+async def list_events_cached(max_results: int) -> List[Dict[str, Any]]:
+    """list_events() run in a worker thread, with results reused for EVENTS_CACHE_TTL seconds."""
+    async with _events_lock:
+        cached = _events_cache.get(max_results)
+        if cached is not None and time.monotonic() - cached[0] < EVENTS_CACHE_TTL:
+            return cached[1]
+        events = await asyncio.to_thread(list_events, max_results)
+        _events_cache[max_results] = (time.monotonic(), events)
+        return events
+
+def _event_time(side: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The 'dateTime' (timed) or 'date' (all-day) of an event's start/end."""
+    return (side.get("dateTime") or side.get("date")) if side else None
+
 @app.get("/api/calendar/connect")
 async def connect_calendar():
     """
@@ -198,6 +303,8 @@ async def connect_calendar():
         print("[API] Initiating Google Calendar connection...")
         # This will block until the user completes the flow
         get_calendar_service()
+        # Token was just written; don't serve a stale "not connected"
+        _conn_cache["t"] = 0.0
         print("[API] Google Calendar connection completed successfully")
         return {"status": "success", "message": "Calendar connected successfully"}
     except Exception as e:
@@ -232,13 +339,9 @@ async def calendar_status():
 @app.get("/api/calendar/config-status")
 async def calendar_config_status():
     """Checks if credentials are configured via environment or file."""
-    import os
     try:
-        env_id = os.getenv("GOOGLE_CALENDAR_CLIENT_ID")
-        env_secret = os.getenv("GOOGLE_CALENDAR_CLIENT_SECRET")
-        has_env = bool(env_id and env_secret)
-        
-        has_file = CREDENTIALS_PATH.exists()
+        has_env = _HAS_ENV_CREDS
+        has_file = credentials_file_exists()
         
         log_msg = f"[API] Credential Check: env={has_env}, file={has_file} ({CREDENTIALS_PATH})"
         print(log_msg)
@@ -265,17 +368,17 @@ async def tool_list_calendar_events(max_results: int = 10):
     
     Called by the remote AI agent to see the user's upcoming schedule.
     """
-    if not is_connected():
+    if not is_connected_cached():
         return {"status": "error", "message": "Calendar not connected"}
     
-    events = list_events(max_results)
+    events = await list_events_cached(max_results)
     return {
         "status": "success",
         "events": [
             {
                 "summary": e.get("summary"),
-                "start": e.get("start", {}).get("dateTime") or e.get("start", {}).get("date"),
-                "end": e.get("end", {}).get("dateTime") or e.get("end", {}).get("date"),
+                "start": _event_time(e.get("start")),
+                "end": _event_time(e.get("end")),
                 "description": e.get("description", "")
             }
             for e in events
@@ -293,45 +396,43 @@ async def update_scheduling_settings_endpoint(settings: SchedulingSettings):
     save_scheduling_settings(settings)
     return {"status": "success", "settings": settings}
 
+# Calendar events counted as study sessions (matched case-insensitively)
+STUDY_SESSION_RE = re.compile(r"study|learning", re.IGNORECASE)
+UTC = datetime.timezone.utc
+
 @app.get("/api/calendar/sessions")
 async def get_study_sessions():
     """Returns scheduled study sessions for the next 48 hours."""
-    if not is_connected():
+    if not is_connected_cached():
         return {"status": "error", "message": "Calendar not connected"}
     
     try:
-        events = list_events(max_results=50) # Fetch more to filter
-        now = datetime.datetime.now(datetime.timezone.utc)
+        events = await list_events_cached(50) # Fetch more to filter
+        now = datetime.datetime.now(UTC)
         limit = now + datetime.timedelta(days=1)
+        # Show all sessions for today (from start of day) and tomorrow
+        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         study_sessions = []
         for e in events:
             # Handle both 'dateTime' (specific time) and 'date' (all-day)
-            start_data = e.get("start", {})
-            start_str = start_data.get("dateTime") or start_data.get("date")
+            start_str = _event_time(e.get("start"))
             if not start_str: continue
             
             try:
-                # Handle all-day events (YYYY-MM-DD) vs timed events
-                if "T" not in start_str:
-                    # All-day event: convert to midnight UTC datetime
-                    start_dt = datetime.datetime.strptime(start_str, "%Y-%m-%d").replace(tzinfo=datetime.timezone.utc)
-                else:
-                    start_dt = datetime.datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+                # Handles all-day events (YYYY-MM-DD) and timed events alike
+                start_dt = ciso8601.parse_datetime(start_str)
                 
-                # Ensure start_dt is timezone-aware for comparison
+                # Ensure start_dt is timezone-aware for comparison (all-day -> midnight UTC)
                 if start_dt.tzinfo is None:
-                    start_dt = start_dt.replace(tzinfo=datetime.timezone.utc)
+                    start_dt = start_dt.replace(tzinfo=UTC)
                 
-                # Show all sessions for today (from start of day) and tomorrow
-                start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
                 if start_of_day <= start_dt <= limit:
-                    summary = e.get("summary", "").lower()
-                    if "study" in summary or "learning" in summary:
+                    if STUDY_SESSION_RE.search(e.get("summary") or ""):
                         study_sessions.append({
                             "summary": e.get("summary"),
                             "start": start_str,
-                            "end": e.get("end", {}).get("dateTime") or e.get("end", {}).get("date")
+                            "end": _event_time(e.get("end"))
                         })
             except Exception as parse_err:
                 print(f"[API] Skipping event due to parse error: {parse_err} (Data: {start_str})")
@@ -361,7 +462,7 @@ async def tool_create_calendar_event(request: CalendarEventRequest):
     
     Called by the remote AI agent to schedule a study session.
     """
-    if not is_connected():
+    if not is_connected_cached():
         return {"status": "error", "message": "Calendar not connected"}
     
     try:
@@ -372,6 +473,8 @@ async def tool_create_calendar_event(request: CalendarEventRequest):
             request.start_time,
             request.end_time
         )
+        # The new event should show up on the next listing
+        _events_cache.clear()
         log_scheduling_event(f"AI AGENT SUCCESS: Event created with ID {event.get('id')}")
         return {"status": "success", "event_id": event.get("id"), "htmlLink": event.get("htmlLink")}
     except Exception as e:
@@ -382,9 +485,6 @@ async def tool_create_calendar_event(request: CalendarEventRequest):
 # =============================================================================
 
 import threading
-import time
-import asyncio
-import httpx
 
 def log_scheduling_event(message: str):
     """Logs scheduling events to a dedicated file for verification."""
@@ -402,7 +502,7 @@ async def trigger_autonomous_scheduling(is_manual=False):
     Triggers the remote AI Scheduling Agent.
     Includes logic to prevent duplicate scheduling for the same day.
     """
-    if not is_connected():
+    if not is_connected_cached():
         log_scheduling_event("Skipping scheduling: Calendar not connected")
         return False
 
@@ -431,24 +531,25 @@ async def trigger_autonomous_scheduling(is_manual=False):
 
     log_scheduling_event(f"Triggering autonomous 24h scheduling (Manual: {is_manual})")
     
-    async with httpx.AsyncClient() as client:
-        current_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        payload = {
-            "user_input": f"Autonomous Scheduling Trigger: Current date and time is {current_time_str}. Please check my calendar for the NEXT 24 HOURS. If No study session exists already for today, find a gap and book exactly ONE 1-hour session. IMPORTANT: You MUST schedule the session AFTER the current time ({current_time_str}). DO NOT book in the past.",
-            "device_callback_url": LOCAL_SERVICE_URL
-        }
-        try:
-            response = await client.post(
-                f"{AI_SERVICE_URL}/api/ai/schedule",
-                json=payload,
-                timeout=180.0
-            )
-            log_scheduling_event(f"AI Service response: {response.status_code} - {response.text[:100]}")
-            
-            return True
-        except Exception as e:
-            log_scheduling_event(f"Failed to trigger AI: {e}")
-            return False
+    client = app.state.http_client
+    current_time_str = now.strftime("%Y-%m-%d %H:%M:%S")
+    payload = {
+        "user_input": f"Autonomous Scheduling Trigger: Current date and time is {current_time_str}. Please check my calendar for the NEXT 24 HOURS. If No study session exists already for today, find a gap and book exactly ONE 1-hour session. IMPORTANT: You MUST schedule the session AFTER the current time ({current_time_str}). DO NOT book in the past.",
+        "device_callback_url": LOCAL_SERVICE_URL
+    }
+    try:
+        response = await client.post(
+            f"{AI_SERVICE_URL}/api/ai/schedule",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=180.0
+        )
+        log_scheduling_event(f"AI Service response: {response.status_code} - {response.text[:100]}")
+        
+        return True
+    except Exception as e:
+        log_scheduling_event(f"Failed to trigger AI: {e}")
+        return False
 
 # Removed background thread as scheduling now happens on startup with daily prevention logic
 
@@ -457,6 +558,9 @@ async def trigger_autonomous_scheduling(is_manual=False):
 # File Upload & Indexing
 # =============================================================================
 
+# Read size when streaming uploaded files to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
 @app.post("/api/upload-materials")
 async def upload_materials(
     topic: str = Form(...),
@@ -475,27 +579,35 @@ async def upload_materials(
     All processing happens on-device.
     """
     upload_dir = Path("uploads") / topic
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(upload_dir)
 
     indexer = get_indexer()
-    file_info = []
+    file_paths = []
     
     for file in files:
         file_path = upload_dir / file.filename
         
-        # Save file locally
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Index the file
-        index_result = indexer.index_file(str(file_path), topic)
-        
-        file_info.append({
+        # Save file locally, streaming in chunks without blocking the event loop
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await buffer.write(chunk)
+        file_paths.append(file_path)
+    
+    # Index all files as one batch (parallel parsing, a single embedding
+    # pass and one FAISS add); this blocks, so run it in a worker thread
+    index_results = await asyncio.to_thread(
+        indexer.index_files, [str(p) for p in file_paths], topic
+    )
+    
+    file_info = [
+        {
             "filename": file.filename,
             "path": str(file_path),
             "index_status": index_result["status"],
             "chunks_created": index_result.get("chunks", 0)
-        })
+        }
+        for file, file_path, index_result in zip(files, file_paths, index_results)
+    ]
 
     return {
         "message": f"Successfully uploaded and indexed {len(files)} files for topic: {topic}",
@@ -508,36 +620,64 @@ async def upload_materials(
 # AI Service Proxy (with device callback URL)
 # =============================================================================
 
+async def _stream_ai_service(path: str, payload: Dict[str, Any], timeout: float) -> StreamingResponse:
+    """
+    POST to the AI service and stream its response body back to the caller
+    as it arrives, instead of buffering and re-encoding it.
+    
+    Connection and HTTP status errors (known before the first byte is
+    forwarded) are raised as HTTPException, as with a buffered proxy.
+    """
+    client = app.state.http_client
+    try:
+        upstream_request = client.build_request(
+            "POST",
+            f"{AI_SERVICE_URL}{path}",
+            content=orjson.dumps(payload),
+            headers=JSON_HEADERS,
+            timeout=timeout
+        )
+        response = await client.send(upstream_request, stream=True)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to connect to AI Service: {e}"
+        )
+    
+    if response.is_error:
+        error_text = (await response.aread()).decode("utf-8", errors="replace")
+        await response.aclose()
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"AI Service error: {error_text}"
+        )
+    
+    async def body():
+        try:
+            async for chunk in response.aiter_bytes():
+                yield chunk
+        finally:
+            await response.aclose()
+    
+    return StreamingResponse(
+        body(),
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json")
+    )
+
+
 @app.post("/api/prerequisites")
 async def proxy_prerequisites(request: TopicRequest):
     """
     Proxy prerequisites request to the AI service.
     Includes the device callback URL for tool invocation.
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            # Include local service URL so AI agent can call back for tools
-            payload = {
-                **request.dict(),
-                "device_callback_url": LOCAL_SERVICE_URL
-            }
-            response = await client.post(
-                f"{AI_SERVICE_URL}/api/ai/prerequisites",
-                json=payload,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code, 
-                detail=f"AI Service error: {e.response.text}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Failed to connect to AI Service: {e}"
-            )
+    # Include local service URL so AI agent can call back for tools
+    payload = {
+        **request.dict(),
+        "device_callback_url": LOCAL_SERVICE_URL
+    }
+    return await _stream_ai_service("/api/ai/prerequisites", payload, timeout=120.0)
 
 
 
@@ -566,13 +706,7 @@ async def list_topics():
     topics = set()
     try:
         indexer = get_indexer()
-        # from index: metadata is a list of dicts; guard against None or wrong type
-        meta_list = indexer.metadata if indexer.metadata is not None else []
-        if not isinstance(meta_list, list):
-            meta_list = []
-        for meta in meta_list:
-            if isinstance(meta, dict) and "topic" in meta:
-                topics.add(meta["topic"])
+        topics.update(indexer.get_topics())
     except Exception:
         traceback.print_exc()
         # Continue with roadmaps only so we don't 500
@@ -592,8 +726,11 @@ async def delete_topic_endpoint(topic_name: str):
     """Delete a topic and all associated data."""
     indexer = get_indexer()
     
-    # Delete from index and files
-    idx_result = indexer.delete_topic(topic_name)
+    # Delete from index and files (rebuilds and saves the index, so it runs
+    # in a worker thread)
+    idx_result = await asyncio.to_thread(indexer.delete_topic, topic_name)
+    # delete_topic removes the topic's upload directory
+    _ensured.discard(Path("uploads") / topic_name)
     
     # Delete saved roadmap
     delete_roadmap(topic_name)
@@ -617,31 +754,13 @@ async def query_with_rag(topic: str = Form(...), query: str = Form(...)):
     # Get relevant context from local index
     context_results = search_knowledge_base(query, top_k=5)
     
-    async with httpx.AsyncClient() as client:
-        try:
-            payload = {
-                "topic": topic,
-                "query": query,
-                "context": context_results,
-                "device_callback_url": LOCAL_SERVICE_URL
-            }
-            response = await client.post(
-                f"{AI_SERVICE_URL}/api/ai/query",
-                json=payload,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"AI Service error: {e.response.text}"
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to connect to AI Service: {e}"
-            )
+    payload = {
+        "topic": topic,
+        "query": query,
+        "context": context_results,
+        "device_callback_url": LOCAL_SERVICE_URL
+    }
+    return await _stream_ai_service("/api/ai/query", payload, timeout=120.0)
 
 
 @app.post("/api/planning")
@@ -650,45 +769,21 @@ async def proxy_planning(request: dict):
     Proxy planning request to AI service.
     Injects device_callback_url automatically.
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            # Inject callback URL
-            request["device_callback_url"] = LOCAL_SERVICE_URL
-            
-            response = await client.post(
-                f"{AI_SERVICE_URL}/api/ai/planning",
-                json=request,
-                timeout=180.0 # Longer timeout for planning
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"AI Service error: {e.response.text}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to connect to AI Service: {e}")
+    # Inject callback URL
+    request["device_callback_url"] = LOCAL_SERVICE_URL
+    # Longer timeout for planning
+    return await _stream_ai_service("/api/ai/planning", request, timeout=180.0)
 
 @app.post("/api/ai/schedule")
 async def proxy_scheduling(request: ScheduleRequest):
     """
     Proxy scheduling request to AI service.
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            payload = {
-                "user_input": request.user_input,
-                "device_callback_url": LOCAL_SERVICE_URL
-            }
-            response = await client.post(
-                f"{AI_SERVICE_URL}/api/ai/schedule",
-                json=payload,
-                timeout=120.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=e.response.status_code, detail=f"AI Service error: {e.response.text}")
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to connect to AI Service: {e}")
+    payload = {
+        "user_input": request.user_input,
+        "device_callback_url": LOCAL_SERVICE_URL
+    }
+    return await _stream_ai_service("/api/ai/schedule", payload, timeout=120.0)
 
 # =============================================================================
 # Lesson Learning Endpoints
@@ -710,50 +805,63 @@ async def start_lesson(request: StartLessonRequest):
         # 1. Check if lesson exists locally
         existing_content = get_lesson_content(request.topic, request.chapter, request.lesson)
         if existing_content:
-            return existing_content.dict()
+            return existing_content.model_dump()
         
         # 2. If not, generate it via AI Service
         # First, get context about the lesson topic
         search_query = f"{request.topic} {request.chapter} {request.lesson}"
         context_chunks = search_knowledge_base(search_query, top_k=5)
         
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "topic": request.topic,
-                "chapter_title": request.chapter,
-                "lesson_title": request.lesson,
-                "context": context_chunks,
-                "device_callback_url": LOCAL_SERVICE_URL
-            }
-            
-            response = await client.post(
+        session = app.state.aio_session
+        payload = {
+            "topic": request.topic,
+            "chapter_title": request.chapter,
+            "lesson_title": request.lesson,
+            "context": context_chunks,
+            "device_callback_url": LOCAL_SERVICE_URL
+        }
+        
+        try:
+            async with session.post(
                 f"{AI_SERVICE_URL}/api/ai/teaching",
-                json=payload,
-                timeout=120.0
+                data=orjson.dumps(payload),
+                headers=JSON_HEADERS
+            ) as response:
+                if response.status >= 400:
+                    raise HTTPException(
+                        status_code=response.status,
+                        detail=f"AI Service error: {await response.text()}"
+                    )
+                # Drain the body as it arrives and parse the joined bytes once
+                chunks = [chunk async for chunk in response.content.iter_any()]
+                generated_data = orjson.loads(b"".join(chunks))
+        except aiohttp.ClientConnectorError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Failed to connect to AI Service: {e}"
             )
-            response.raise_for_status()
-            generated_data = response.json()
-            
-            # 3. Save to local storage
-            lesson_content = generated_data["lesson_content"]
-            
-            final_content = {
-                "topic": request.topic,
-                "chapter": request.chapter,
-                "lesson_title": request.lesson,
-                "content_markdown": lesson_content.get("content_markdown", ""),
-                "questions": lesson_content.get("questions", [])
-            }
-            
-            # Save it
-            from lesson_storage import LessonContent
-            save_lesson_content(LessonContent.parse_obj(final_content))
-            
-            # Initialize progress if first time
-            init_progress(request.topic, request.chapter, request.lesson)
-            
-            return final_content
-            
+        
+        # 3. Save to local storage
+        lesson_content = generated_data["lesson_content"]
+        
+        final_content = {
+            "topic": request.topic,
+            "chapter": request.chapter,
+            "lesson_title": request.lesson,
+            "content_markdown": lesson_content.get("content_markdown", ""),
+            "questions": lesson_content.get("questions", [])
+        }
+        
+        # Save it
+        save_lesson_content(LessonContent.model_validate(final_content))
+        
+        # Initialize progress if first time
+        init_progress(request.topic, request.chapter, request.lesson)
+        
+        return final_content
+        
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -761,6 +869,12 @@ async def start_lesson(request: StartLessonRequest):
         raise HTTPException(status_code=500, detail=f"Failed to generate lesson: {str(e)}")
 
 
+@app.get("/api/lessons/progress-summary")
+async def get_progress_summary():
+    """Completed-lesson count across all topics (polled by the overlay lockdown)."""
+    return {"total_completed": get_total_completed()}
+
+
 @app.get("/api/lessons/progress/{topic}")
 async def get_topic_progress(topic: str):
     """Get learning progress for a topic."""
@@ -1,12 +1,26 @@
-"""RAG module for local file indexing and retrieval."""
-
-from .indexer import LocalIndexer, get_indexer
-from .retriever import LocalRetriever, get_retriever, search_knowledge_base
-
-__all__ = [
-    "LocalIndexer",
-    "get_indexer", 
-    "LocalRetriever",
-    "get_retriever",
-    "search_knowledge_base"
-]
+"""
+RAG module for local file indexing and retrieval.
+
+The indexer and retriever (torch, sentence-transformers, faiss) are only
+imported on first use, so the split worker processes, which import just
+rag.chunking, stay lightweight.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "LocalIndexer": ".indexer",
+    "get_indexer": ".indexer",
+    "LocalRetriever": ".retriever",
+    "get_retriever": ".retriever",
+    "search_knowledge_base": ".retriever",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name, __name__), name)
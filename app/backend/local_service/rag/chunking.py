@@ -0,0 +1,152 @@
+"""
+Text Extraction and Chunking
+
+Parses uploaded files (PDF, TXT) and splits their text into token-sized
+chunks. Kept free of torch / sentence-transformers / faiss so the process
+pool LocalIndexer.index_files uses for this work starts cheaply.
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+from semantic_text_splitter import TextSplitter
+from tokenizers import Tokenizer
+import pypdfium2 as pdfium
+from PyPDF2 import PdfReader
+
+
+def build_text_splitter(tokenizer: Tokenizer) -> TextSplitter:
+    """
+    Build the token-aware (Rust-backed) text splitter, sized with the
+    embedding model's own tokenizer so chunks match its input budget.
+    """
+    return TextSplitter.from_huggingface_tokenizer(tokenizer, capacity=256, overlap=50)
+
+
+def splitter_tokenizer(tokenizer: Tokenizer) -> Tokenizer:
+    """
+    Return a copy of tokenizer with truncation and padding turned off.
+    
+    transformers enables truncation on the backend tokenizer the first time
+    the model encodes anything; a splitter counting with that would never
+    see more than max_seq_length tokens and pass whole documents through as
+    a single chunk.
+    """
+    clean = Tokenizer.from_str(tokenizer.to_str())
+    clean.no_truncation()
+    clean.no_padding()
+    return clean
+
+
+def extract_text_from_file(file_path: str, cache_dir: Optional[Path] = None) -> str:
+    """
+    Extract text content from a file.
+    
+    When cache_dir is given, extracted text is memoized there keyed by the
+    file's path, mtime and size, so re-indexing an unchanged file skips
+    parsing entirely.
+    """
+    if cache_dir is None:
+        return _parse_text_from_file(file_path)
+    
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return _parse_text_from_file(file_path)
+    
+    path_hash = hashlib.sha1(str(Path(file_path).resolve()).encode()).hexdigest()
+    cache_path = Path(cache_dir) / f"{path_hash}-{stat.st_mtime_ns}-{stat.st_size}.txt"
+    if cache_path.exists():
+        try:
+            return cache_path.read_text(encoding="utf-8")
+        except Exception as e:
+            print(f"Error reading text cache {cache_path}: {e}")
+    
+    text = _parse_text_from_file(file_path)
+    if text.strip():
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Drop extractions of older versions of the same file
+            for stale in cache_path.parent.glob(f"{path_hash}-*.txt"):
+                stale.unlink(missing_ok=True)
+            cache_path.write_text(text, encoding="utf-8")
+        except Exception as e:
+            print(f"Error writing text cache {cache_path}: {e}")
+    return text
+
+
+def _read_pdf_pdfium(file_path: str) -> str:
+    """Extract PDF text with pdfium (C, much faster than PyPDF2)."""
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        pages = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            page_text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            if page_text:
+                pages.append(page_text + "\n")
+        return "".join(pages)
+    finally:
+        pdf.close()
+
+
+def _read_pdf_pypdf2(file_path: str) -> str:
+    """Extract PDF text with PyPDF2 (fallback for files pdfium rejects)."""
+    reader = PdfReader(file_path)
+    return "".join(page_text + "\n" for page_text in (page.extract_text() for page in reader.pages) if page_text)
+
+
+def _parse_text_from_file(file_path: str) -> str:
+    """Parse text content out of a file (PDF or plain text)."""
+    path = Path(file_path)
+    
+    if path.suffix.lower() == ".pdf":
+        try:
+            return _read_pdf_pdfium(file_path)
+        except Exception as e:
+            print(f"pdfium failed on {file_path} ({e}), falling back to PyPDF2")
+        try:
+            return _read_pdf_pypdf2(file_path)
+        except Exception as e:
+            print(f"Error reading PDF {file_path}: {e}")
+            return ""
+    
+    elif path.suffix.lower() in [".txt", ".md", ".py", ".js", ".json"]:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except Exception as e:
+            print(f"Error reading text file {file_path}: {e}")
+            return ""
+    
+    else:
+        print(f"Unsupported file type: {path.suffix}")
+        return ""
+
+
+# Per-process state of the split worker pool (see LocalIndexer.index_files)
+_worker_text_splitter: Optional[TextSplitter] = None
+_worker_text_cache_dir: Optional[Path] = None
+
+
+def init_split_worker(tokenizer_json: str, text_cache_dir: Path):
+    """Process pool initializer: build the splitter once per worker."""
+    global _worker_text_splitter, _worker_text_cache_dir
+    _worker_text_splitter = build_text_splitter(Tokenizer.from_str(tokenizer_json))
+    _worker_text_cache_dir = text_cache_dir
+
+
+def extract_and_split(file_path: str) -> Tuple[str, Optional[List[str]]]:
+    """
+    Extract and chunk a file inside a worker process.
+    
+    Returns:
+        (file_path, chunks), with chunks set to None if no text was extracted
+    """
+    text = extract_text_from_file(file_path, _worker_text_cache_dir)
+    if not text.strip():
+        return file_path, None
+    return file_path, _worker_text_splitter.chunks(text)
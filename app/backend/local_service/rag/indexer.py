@@ -13,13 +13,22 @@ All data remains on the user's device.
 import os
 import json
 import pickle
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from PyPDF2 import PdfReader
+from .chunking import (
+    build_text_splitter, splitter_tokenizer, extract_text_from_file,
+    init_split_worker, extract_and_split
+)
+
+
+# Chunks embedded per forward pass; chunks are length-sorted first so each
+# batch only pads up to its own longest member.
+ENCODE_BATCH_SIZE = 64
 
 
 class LocalIndexer:
@@ -34,23 +43,47 @@ class LocalIndexer:
         
         self.index_path = self.data_dir / "faiss.index"
         self.metadata_path = self.data_dir / "metadata.pkl"
+        self.text_cache_dir = self.data_dir / "text_cache"
         
         # Load local embedding model (runs entirely on-device)
         print(f"Loading embedding model: {embedding_model}")
         self.model = SentenceTransformer(embedding_model)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
-        
-        # Text splitter for chunking
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=500,
-            chunk_overlap=100,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
+        self._normalize_embeddings = any(
+            type(module).__name__ == "Normalize" for module in self.model
         )
+        # _encode_chunks' direct path reproduces Transformer -> mean Pooling
+        # (-> Normalize) only; any other pipeline goes through model.encode
+        modules = list(self.model)
+        self._direct_encode = (
+            len(modules) >= 2
+            and hasattr(modules[0], "auto_model")
+            and type(modules[1]).__name__ == "Pooling"
+            and modules[1].get_pooling_mode_str() == "mean"
+            and all(type(module).__name__ == "Normalize" for module in modules[2:])
+        )
+        
+        # Text splitter for chunking, on a truncation-free tokenizer copy
+        # (split workers rebuild it from the serialized form)
+        tokenizer = splitter_tokenizer(self.model.tokenizer.backend_tokenizer)
+        self.text_splitter = build_text_splitter(tokenizer)
+        self._splitter_tokenizer_json = tokenizer.to_str()
+        # Process pool for index_files, started on first multi-file upload
+        # and kept for the life of the process
+        self._split_pool: Optional[ProcessPoolExecutor] = None
+        self._split_pool_lock = threading.Lock()
         
         # Load or create index
         self.index: Optional[faiss.IndexFlatL2] = None
         self.metadata: List[Dict[str, Any]] = []
+        # Bumped on every index mutation so retrieval caches can key on it
+        self.version = 0
+        # Serializes writers (indexing runs in worker threads), including
+        # their save to disk; FAISS is not thread-safe for writes
+        self._write_lock = threading.Lock()
+        # Guards index/metadata between writers and readers; only held for
+        # in-memory work, never for disk I/O
+        self._state_lock = threading.Lock()
         self._load_or_create_index()
     
     def _load_or_create_index(self):
@@ -67,39 +100,186 @@ class LocalIndexer:
             self.metadata = []
     
     def _save_index(self):
-        """Persist the index and metadata to disk."""
-        faiss.write_index(self.index, str(self.index_path))
+        """
+        Persist the index and metadata to disk.
+        
+        Call with _write_lock held. The state is snapshotted under
+        _state_lock and written without it, so searches are not blocked
+        by the disk I/O.
+        """
+        with self._state_lock:
+            index_bytes = faiss.serialize_index(self.index)
+            metadata_bytes = pickle.dumps(self.metadata)
+        with open(self.index_path, "wb") as f:
+            f.write(index_bytes.tobytes())
         with open(self.metadata_path, "wb") as f:
-            pickle.dump(self.metadata, f)
+            f.write(metadata_bytes)
+    
+    def search(self, query_embedding: np.ndarray, top_k: int) -> List[Tuple[int, float, Dict[str, Any]]]:
+        """
+        Search the index, consistently with concurrent indexing.
+        
+        Args:
+            query_embedding: float32 array of shape (1, embedding_dim)
+            top_k: Maximum number of hits
+            
+        Returns:
+            (chunk index, L2 distance, chunk metadata) per hit, nearest first
+        """
+        with self._state_lock:
+            if self.index is None or self.index.ntotal == 0:
+                return []
+            actual_k = min(top_k, self.index.ntotal)
+            distances, indices = self.index.search(query_embedding, actual_k)  # type: ignore
+            return [
+                (int(idx), float(distance), self.metadata[idx])
+                for idx, distance in zip(indices[0], distances[0])
+                if 0 <= idx < len(self.metadata)
+            ]
+    
+    def get_topics(self) -> set:
+        """Return the set of topics with indexed chunks."""
+        with self._state_lock:
+            return {meta["topic"] for meta in self.metadata if "topic" in meta}
+    
+    def _encode_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Embed chunks by tokenizing and running the transformer directly.
+        
+        Chunks are sorted by length and processed in buckets so padding is
+        bounded by the longest chunk in each bucket rather than the whole
+        document. Pooling mirrors the SentenceTransformer pipeline (mean
+        pooling + optional L2 normalization), keeping vectors compatible with
+        those already in the index; models pooled any other way (CLS, max,
+        extra Dense layers, ...) fall back to model.encode. Original chunk
+        order is preserved.
+        
+        Args:
+            chunks: Text chunks to embed
+            
+        Returns:
+            float32 array of shape (len(chunks), embedding_dim)
+        """
+        if not self._direct_encode:
+            # Not a mean-pooled pipeline; let SentenceTransformer handle it
+            embeddings = self.model.encode(chunks, show_progress_bar=False)
+            return np.array(embeddings).astype("float32")
+        
+        import torch
+        
+        transformer = self.model[0]
+        tokenizer = transformer.tokenizer
+        device = self.model.device
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]))
+        embeddings = np.empty((len(chunks), self.embedding_dim), dtype="float32")
+        
+        with torch.no_grad():
+            for start in range(0, len(order), ENCODE_BATCH_SIZE):
+                bucket = order[start:start + ENCODE_BATCH_SIZE]
+                features = tokenizer(
+                    [chunks[i] for i in bucket],
+                    padding=True,
+                    truncation=True,
+                    max_length=transformer.max_seq_length,
+                    return_tensors="pt"
+                )
+                features = {k: v.to(device) for k, v in features.items()}
+                token_embeddings = transformer.auto_model(**features)[0]
+                
+                # Mean pooling over non-padding tokens (per the model card)
+                mask = features["attention_mask"].unsqueeze(-1).to(token_embeddings.dtype)
+                pooled = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                if self._normalize_embeddings:
+                    pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+                
+                embeddings[bucket] = pooled.cpu().numpy()
+        
+        return embeddings
     
     def _extract_text_from_file(self, file_path: str) -> str:
-        """Extract text content from a file."""
-        path = Path(file_path)
+        """Extract text content from a file (memoized in text_cache_dir)."""
+        return extract_text_from_file(file_path, self.text_cache_dir)
+    
+    def _split_file(self, file_path: str) -> Tuple[str, Optional[List[str]]]:
+        """Extract and chunk a file in this process (see extract_and_split)."""
+        text = self._extract_text_from_file(file_path)
+        if not text.strip():
+            return file_path, None
+        return file_path, self.text_splitter.chunks(text)
+    
+    def _index_split_files(
+        self,
+        split_files: List[Tuple[str, Optional[List[str]]]],
+        topic: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Embed and add already-chunked files to the index in a single batch.
         
-        if path.suffix.lower() == ".pdf":
-            try:
-                reader = PdfReader(file_path)
-                text = ""
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text
-            except Exception as e:
-                print(f"Error reading PDF {file_path}: {e}")
-                return ""
+        Embedding runs unlocked so concurrent callers can overlap it; the
+        FAISS add, metadata update and save happen under the write lock.
         
-        elif path.suffix.lower() in [".txt", ".md", ".py", ".js", ".json"]:
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    return f.read()
-            except Exception as e:
-                print(f"Error reading text file {file_path}: {e}")
-                return ""
+        Args:
+            split_files: (file_path, chunks) pairs; chunks is None if no
+                text could be extracted
+            topic: Topic/category for the files
+            
+        Returns:
+            List of per-file indexing results, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        pending = []
+        all_chunks: List[str] = []
         
-        else:
-            print(f"Unsupported file type: {path.suffix}")
-            return ""
+        for file_path, chunks in split_files:
+            if chunks is None:
+                results.append({"status": "error", "message": "No text extracted", "chunks": 0})
+            elif not chunks:
+                results.append({"status": "error", "message": "No chunks created", "chunks": 0})
+            else:
+                pending.append((len(results), file_path, chunks))
+                results.append(None)
+                all_chunks.extend(chunks)
+        
+        if not all_chunks:
+            return results
+        
+        # Generate embeddings locally, one batch for all files
+        embeddings = self._encode_chunks(all_chunks)
+        
+        with self._write_lock:
+            with self._state_lock:
+                # Add to FAISS index
+                start_idx = self.index.ntotal
+                self.index.add(embeddings)
+                
+                # Store metadata for each chunk
+                chunk_id = start_idx
+                for slot, file_path, chunks in pending:
+                    file_name = Path(file_path).name
+                    for chunk in chunks:
+                        self.metadata.append({
+                            "chunk_id": chunk_id,
+                            "content": chunk,
+                            "source": file_name,
+                            "topic": topic,
+                            "file_path": file_path
+                        })
+                        chunk_id += 1
+                    results[slot] = {
+                        "status": "success",
+                        "file": file_name,
+                        "chunks": len(chunks),
+                    }
+                self.version += 1
+                total_vectors = self.index.ntotal
+            
+            # Persist to disk
+            self._save_index()
+            
+            for slot, _, _ in pending:
+                results[slot]["total_vectors"] = total_vectors
+        
+        return results
     
     def index_file(self, file_path: str, topic: str) -> Dict[str, Any]:
         """
@@ -112,58 +292,46 @@ class LocalIndexer:
         Returns:
             Dict with indexing results
         """
-        # Extract text
-        text = self._extract_text_from_file(file_path)
-        if not text.strip():
-            return {"status": "error", "message": "No text extracted", "chunks": 0}
-        
-        # Split into chunks
-        chunks = self.text_splitter.split_text(text)
-        if not chunks:
-            return {"status": "error", "message": "No chunks created", "chunks": 0}
-        
-        # Generate embeddings locally
-        embeddings = self.model.encode(chunks, show_progress_bar=False)
-        embeddings = np.array(embeddings).astype("float32")
-        
-        # Add to FAISS index
-        start_idx = self.index.ntotal
-        self.index.add(embeddings)
-        
-        # Store metadata for each chunk
-        file_name = Path(file_path).name
-        for i, chunk in enumerate(chunks):
-            self.metadata.append({
-                "chunk_id": start_idx + i,
-                "content": chunk,
-                "source": file_name,
-                "topic": topic,
-                "file_path": file_path
-            })
+        return self._index_split_files([self._split_file(file_path)], topic)[0]
+    
+    def index_files(self, file_paths: List[str], topic: str) -> List[Dict[str, Any]]:
+        """
+        Index multiple files.
         
-        # Persist to disk
-        self._save_index()
+        Text extraction and chunking (CPU-bound PDF parsing) run in parallel
+        across a process pool; the chunks of all files are then embedded and
+        added to the index in one batch in this process.
+        """
+        if len(file_paths) <= 1:
+            return [self.index_file(path, topic) for path in file_paths]
         
-        return {
-            "status": "success",
-            "file": file_name,
-            "chunks": len(chunks),
-            "total_vectors": self.index.ntotal
-        }
+        split_files = list(self._get_split_pool().map(extract_and_split, file_paths))
+        return self._index_split_files(split_files, topic)
     
-    def index_files(self, file_paths: List[str], topic: str) -> List[Dict[str, Any]]:
-        """Index multiple files."""
-        results = []
-        for path in file_paths:
-            result = self.index_file(path, topic)
-            results.append(result)
-        return results
+    def _get_split_pool(self) -> ProcessPoolExecutor:
+        """
+        Return the long-lived split worker pool, creating it on first use.
+        
+        Workers only import rag.chunking (no torch / faiss), and are spawned
+        on demand up to one per CPU.
+        """
+        with self._split_pool_lock:
+            if self._split_pool is None:
+                self._split_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    initializer=init_split_worker,
+                    initargs=(self._splitter_tokenizer_json, self.text_cache_dir)
+                )
+            return self._split_pool
     
     def get_stats(self) -> Dict[str, Any]:
         """Get statistics about the current index."""
+        with self._state_lock:
+            total_vectors = self.index.ntotal if self.index else 0
+            total_chunks = len(self.metadata)
         return {
-            "total_vectors": self.index.ntotal if self.index else 0,
-            "total_chunks": len(self.metadata),
+            "total_vectors": total_vectors,
+            "total_chunks": total_chunks,
             "embedding_dim": self.embedding_dim,
             "index_path": str(self.index_path),
             "index_exists": self.index_path.exists()
@@ -171,81 +339,91 @@ class LocalIndexer:
     
     def clear_index(self):
         """Clear the entire index (use with caution)."""
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
-        self.metadata = []
-        self._save_index()
+        with self._write_lock:
+            with self._state_lock:
+                self.index = faiss.IndexFlatL2(self.embedding_dim)
+                self.metadata = []
+                self.version += 1
+            self._save_index()
         return {"status": "cleared"}
 
     def delete_topic(self, topic: str):
         """
         Delete a topic and its associated files and vector data.
         
+        Blocks for the rebuild and save; call it off the event loop.
+        
         Args:
             topic: The topic name to delete
         """
-        try:
-            # 1. Remove files
-            topic_dir = Path("uploads") / topic
-            if topic_dir.exists():
-                import shutil
-                shutil.rmtree(topic_dir)
-                print(f"Deleted files for topic: {topic}")
-            
-            # 2. Filter metadata (keep only other topics)
-            if not self.metadata:
-                print(f"Index is empty, nothing to delete for topic: {topic}")
-                return {"status": "success", "message": "Index already empty"}
-
-            indices_to_keep = []
-            new_metadata = []
-            for i, meta in enumerate(self.metadata):
-                if meta.get("topic") != topic:
-                    indices_to_keep.append(i)
-                    new_metadata.append(meta)
-            
-            if len(new_metadata) == len(self.metadata):
-                print(f"Topic '{topic}' not found in index metadata.")
-                return {"status": "not_found", "message": "Topic not found in index"}
+        with self._write_lock:
+            try:
+                # 1. Remove files
+                topic_dir = Path("uploads") / topic
+                if topic_dir.exists():
+                    import shutil
+                    shutil.rmtree(topic_dir)
+                    print(f"Deleted files for topic: {topic}")
                 
-            # 3. Rebuild Index
-            print(f"Rebuilding index after deleting topic: {topic}")
-            
-            if not indices_to_keep:
-                # All topics were the deleted one
-                self.index = faiss.IndexFlatL2(self.embedding_dim)
-                self.metadata = []
-                print("Index now empty after deletion.")
-            else:
-                # Create new index and migrate vectors
-                new_index = faiss.IndexFlatL2(self.embedding_dim)
-                kept_vectors_list = []
-                for i in indices_to_keep:
-                    try:
-                        vec = self.index.reconstruct(i)
-                        kept_vectors_list.append(vec)
-                    except Exception as e:
-                        print(f"Error reconstructing vector {i}: {e}")
-                        continue
+                # 2. Filter metadata (keep only other topics)
+                if not self.metadata:
+                    print(f"Index is empty, nothing to delete for topic: {topic}")
+                    return {"status": "success", "message": "Index already empty"}
+    
+                indices_to_keep = []
+                new_metadata = []
+                for i, meta in enumerate(self.metadata):
+                    if meta.get("topic") != topic:
+                        indices_to_keep.append(i)
+                        new_metadata.append(meta)
                 
-                if kept_vectors_list:
-                    kept_vectors_np = np.array(kept_vectors_list).astype('float32')
-                    new_index.add(kept_vectors_np)
+                if len(new_metadata) == len(self.metadata):
+                    print(f"Topic '{topic}' not found in index metadata.")
+                    return {"status": "not_found", "message": "Topic not found in index"}
+                    
+                # 3. Rebuild Index
+                print(f"Rebuilding index after deleting topic: {topic}")
                 
-                self.index = new_index
-                self.metadata = new_metadata
+                if not indices_to_keep:
+                    # All topics were the deleted one
+                    with self._state_lock:
+                        self.index = faiss.IndexFlatL2(self.embedding_dim)
+                        self.metadata = []
+                        self.version += 1
+                    print("Index now empty after deletion.")
+                else:
+                    # Create new index and migrate vectors
+                    new_index = faiss.IndexFlatL2(self.embedding_dim)
+                    kept_vectors_list = []
+                    for i in indices_to_keep:
+                        try:
+                            vec = self.index.reconstruct(i)
+                            kept_vectors_list.append(vec)
+                        except Exception as e:
+                            print(f"Error reconstructing vector {i}: {e}")
+                            continue
+                    
+                    if kept_vectors_list:
+                        kept_vectors_np = np.array(kept_vectors_list).astype('float32')
+                        new_index.add(kept_vectors_np)
+                    
+                    with self._state_lock:
+                        self.index = new_index
+                        self.metadata = new_metadata
+                        
+                        # Re-assign chunk_ids (FAISS IDs are sequential 0 to N-1 for Flat index)
+                        for i, meta in enumerate(self.metadata):
+                            meta["chunk_id"] = i
+                        self.version += 1
                 
-                # Re-assign chunk_ids (FAISS IDs are sequential 0 to N-1 for Flat index)
-                for i, meta in enumerate(self.metadata):
-                    meta["chunk_id"] = i
-            
-            self._save_index()
-            return {"status": "success", "message": f"Deleted topic {topic}"}
-            
-        except Exception as e:
-            print(f"CRITICAL ERROR in delete_topic: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return {"status": "error", "message": str(e)}
+                self._save_index()
+                return {"status": "success", "message": f"Deleted topic {topic}"}
+                
+            except Exception as e:
+                print(f"CRITICAL ERROR in delete_topic: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                return {"status": "error", "message": str(e)}
 
 
 # Singleton instance for the local service
@@ -9,11 +9,16 @@ Handles retrieval from the local FAISS index:
 This module exposes the search_knowledge_base functionality.
 """
 
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from .indexer import get_indexer, LocalIndexer
 
 
+# Maximum number of cached search results / query embeddings
+SEARCH_CACHE_SIZE = 512
+
+
 class LocalRetriever:
     """
     Retrieves relevant chunks from the local FAISS index.
@@ -22,6 +27,25 @@ class LocalRetriever:
     
     def __init__(self, indexer: Optional[LocalIndexer] = None):
         self.indexer = indexer or get_indexer()
+        
+        # LRU caches; results are keyed on the index version so any
+        # mutation implicitly invalidates them
+        self._result_cache: "OrderedDict[Tuple[str, int, int], Tuple[Dict[str, Any], ...]]" = OrderedDict()
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query locally, reusing the embedding for repeated queries."""
+        embedding = self._embedding_cache.get(query)
+        if embedding is not None:
+            self._embedding_cache.move_to_end(query)
+            return embedding
+        
+        embedding = self.indexer.model.encode([query], show_progress_bar=False)
+        embedding = np.array(embedding).astype("float32")
+        self._embedding_cache[query] = embedding
+        if len(self._embedding_cache) > SEARCH_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+        return embedding
     
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
@@ -37,34 +61,41 @@ class LocalRetriever:
         Returns:
             List of retrieved chunks with content, source, and relevance score
         """
-        if self.indexer.index is None or self.indexer.index.ntotal == 0:
-            return []
+        cache_key = (query, top_k, self.indexer.version)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            self._result_cache.move_to_end(cache_key)
+            return [dict(r) for r in cached]
         
         # Embed the query locally (never sent to remote server)
-        query_embedding = self.indexer.model.encode([query], show_progress_bar=False)
-        query_embedding = np.array(query_embedding).astype("float32")
-        
-        # Limit top_k to available vectors
-        actual_k = min(top_k, self.indexer.index.ntotal)
+        query_embedding = self._embed_query(query)
         
-        # Search FAISS index
-        distances, indices = self.indexer.index.search(query_embedding, actual_k)  # type: ignore
+        # Search FAISS index (under the indexer's lock, so concurrent
+        # uploads cannot interleave with it)
+        hits = self.indexer.search(query_embedding, top_k)
         
         # Build results with metadata
         results = []
-        for i, idx in enumerate(indices[0]):
-            if idx < len(self.indexer.metadata):
-                chunk_meta = self.indexer.metadata[idx]
-                results.append({
-                    "content": chunk_meta["content"],
-                    "source": chunk_meta["source"],
-                    "topic": chunk_meta.get("topic", ""),
-                    "relevance_score": float(1 / (1 + distances[0][i])),  # Convert distance to similarity
-                    "chunk_id": int(idx)
-                })
+        for idx, distance, chunk_meta in hits:
+            results.append({
+                "content": chunk_meta["content"],
+                "source": chunk_meta["source"],
+                "topic": chunk_meta.get("topic", ""),
+                "relevance_score": float(1 / (1 + distance)),  # Convert distance to similarity
+                "chunk_id": idx
+            })
+        
+        frozen = tuple(dict(r) for r in results)
+        self._cache_results(cache_key, frozen)
         
         return results
     
+    def _cache_results(self, cache_key: Tuple[str, int, int], results: Tuple[Dict[str, Any], ...]):
+        """Store results in the exact-match LRU cache."""
+        self._result_cache[cache_key] = results
+        if len(self._result_cache) > SEARCH_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+    
     def search_by_topic(self, query: str, topic: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Search within a specific topic.
@@ -2,39 +2,56 @@
 Local Roadmap Storage
 Simple JSON-based storage for generated roadmaps.
 """
-import json
+import orjson
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 
 DATA_DIR = Path("data")
 ROADMAPS_FILE = DATA_DIR / "roadmaps.json"
 
+# (mtime_ns, roadmaps) of the last parsed roadmaps file
+_roadmaps_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
 def _load_roadmaps() -> Dict[str, Any]:
-    if not ROADMAPS_FILE.exists():
+    """
+    Load all roadmaps, re-parsing the file only when its mtime changes.
+    The returned dict is shared; copy it before mutating.
+    """
+    global _roadmaps_cache
+    try:
+        mtime = ROADMAPS_FILE.stat().st_mtime_ns
+    except OSError:
         return {}
+    if _roadmaps_cache is not None and _roadmaps_cache[0] == mtime:
+        return _roadmaps_cache[1]
     try:
-        with open(ROADMAPS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return data if isinstance(data, dict) else {}
+        with open(ROADMAPS_FILE, "rb") as f:
+            data = orjson.loads(f.read())
+        data = data if isinstance(data, dict) else {}
     except Exception:
         return {}
+    _roadmaps_cache = (mtime, data)
+    return data
 
 def _save_roadmaps(roadmaps: Dict[str, Any]):
+    global _roadmaps_cache
     DATA_DIR.mkdir(exist_ok=True)
-    with open(ROADMAPS_FILE, "w") as f:
-        json.dump(roadmaps, f, indent=2)
+    _roadmaps_cache = None
+    with open(ROADMAPS_FILE, "wb") as f:
+        f.write(orjson.dumps(roadmaps, option=orjson.OPT_INDENT_2))
+    _roadmaps_cache = (ROADMAPS_FILE.stat().st_mtime_ns, roadmaps)
 
 def save_roadmap(topic: str, roadmap: Dict[str, Any]):
-    roadmaps = _load_roadmaps()
+    roadmaps = dict(_load_roadmaps())
     roadmaps[topic] = roadmap
     _save_roadmaps(roadmaps)
 
 def get_roadmap(topic: str) -> Optional[Dict[str, Any]]:
-    roadmaps = _load_roadmaps()
-    return roadmaps.get(topic)
+    return _load_roadmaps().get(topic)
 
 def delete_roadmap(topic: str):
     roadmaps = _load_roadmaps()
     if topic in roadmaps:
+        roadmaps = dict(roadmaps)
         del roadmaps[topic]
         _save_roadmaps(roadmaps)
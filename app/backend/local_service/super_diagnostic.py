@@ -1,9 +1,23 @@
 import os
-import json
+import orjson
 import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
+def _read_json_if_exists(path: Path):
+    """
+    Raw bytes of path (one open, no exists/stat), or None if it does not
+    exist or cannot be read; read failures (permissions, a lock held by
+    another process, ...) are reported rather than raised.
+    """
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        print(f"Read error: {e}")
+        return None
+
 def run_super_diagnostic():
     print("=== RESOLUT CALENDAR SUPER DIAGNOSTIC ===")
     
@@ -34,15 +48,15 @@ def run_super_diagnostic():
     # 4. credentials.json Check
     creds_path = local_service_path / "data" / "calendar" / "credentials.json"
     print(f"\nChecking credentials.json at: {creds_path}")
-    if creds_path.exists():
+    creds_raw = _read_json_if_exists(creds_path)
+    if creds_raw is not None:
         print("FOUND credentials.json")
         try:
-            with open(creds_path, 'r') as f:
-                data = json.load(f)
-                if 'installed' in data or 'web' in data:
-                    print("Format: VALID")
-                else:
-                    print(f"Format: INVALID (Keys found: {list(data.keys())})")
+            data = orjson.loads(creds_raw)
+            if 'installed' in data or 'web' in data:
+                print("Format: VALID")
+            else:
+                print(f"Format: INVALID (Keys found: {list(data.keys())})")
         except Exception as e:
             print(f"Read error: {e}")
     else:
@@ -51,15 +65,15 @@ def run_super_diagnostic():
     # 5. token.json Check
     token_path = local_service_path / "data" / "calendar" / "token.json"
     print(f"\nChecking token.json at: {token_path}")
-    if token_path.exists():
-        print(f"FOUND token.json ({token_path.stat().st_size} bytes)")
+    token_raw = _read_json_if_exists(token_path)
+    if token_raw is not None:
+        print(f"FOUND token.json ({len(token_raw)} bytes)")
         try:
-            with open(token_path, 'r') as f:
-                data = json.load(f)
-                print(f"Token keys: {list(data.keys())}")
-                expiry = data.get('expiry')
-                if expiry:
-                    print(f"Expiry: {expiry}")
+            data = orjson.loads(token_raw)
+            print(f"Token keys: {list(data.keys())}")
+            expiry = data.get('expiry')
+            if expiry:
+                print(f"Expiry: {expiry}")
         except Exception as e:
             print(f"Read error: {e}")
     else:
@@ -67,7 +81,7 @@ def run_super_diagnostic():
 
     # 6. Final Status check logic (Matches main.py)
     has_env = bool(os.getenv("GOOGLE_CALENDAR_CLIENT_ID") and os.getenv("GOOGLE_CALENDAR_CLIENT_SECRET"))
-    has_file = creds_path.exists()
+    has_file = creds_raw is not None
     print(f"\n--- Result ---")
     print(f"Final has_credentials: {has_env or has_file}")
 
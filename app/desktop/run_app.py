@@ -5,46 +5,268 @@ import sys
 import time
 import subprocess
 import signal
+import socket
+import atexit
+import psutil
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Base project directory
 ROOT_DIR = Path(__file__).parent.parent
 
-def kill_port_process(port):
-    """Kill process listening on the given port (Windows only for now)."""
+# Child output goes to app/desktop/*.log only when RESOLUT_VERBOSE is set
+VERBOSE = bool(os.environ.get("RESOLUT_VERBOSE"))
+
+# DevTools/remote debugging in the webview only when RESOLUT_DEBUG is set
+DEBUG = bool(os.environ.get("RESOLUT_DEBUG"))
+
+# Backend ports plus the ports Vite may pick
+SERVICE_PORTS = {8000, 8001, 5173, 5174, 5175}
+
+# Readiness polling: seconds between probe rounds / per-request timeout
+PROBE_INTERVAL = 0.1
+PROBE_TIMEOUT = 0.2
+
+# Per-user cache directory (outside the install, which may be read-only)
+if sys.platform == 'win32':
+    CACHE_DIR = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "Resolut"
+else:
+    CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "resolut"
+
+# Vite ports in default order; the one that answered last launch is tried first
+VITE_PORTS = [5173, 5174, 5175]
+LAST_VITE_PORT_FILE = CACHE_DIR / "last_vite_port"
+
+# Shared keep-alive session for readiness probes
+_probe_session = requests.Session()
+_probe_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Seconds a child tree gets to exit after SIGTERM before it is SIGKILLed
+SHUTDOWN_GRACE = 2.0
+
+# (name, process, kill group) for every spawned child. The kill group is the
+# POSIX process-group id, or on Windows a Job Object handle whose closing
+# makes the kernel terminate every process in the tree.
+_children = []
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    class _IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+        )]
+
+    class _JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_longlong),
+            ("PerJobUserTimeLimit", ctypes.c_longlong),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+
+    class _JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", _JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", _IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+
+    _JobObjectExtendedLimitInformation = 9
+    _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+    _PROCESS_SET_QUOTA = 0x0100
+    _PROCESS_TERMINATE = 0x0001
+    _CREATE_SUSPENDED = 0x00000004
+
+    _kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    def _create_kill_job(pid):
+        """Put pid in a new kill-on-close Job Object and return the job handle."""
+        job = _kernel32.CreateJobObjectW(None, None)
+        if not job:
+            raise ctypes.WinError(ctypes.get_last_error())
+        try:
+            info = _JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+            info.BasicLimitInformation.LimitFlags = _JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+            if not _kernel32.SetInformationJobObject(
+                wintypes.HANDLE(job), _JobObjectExtendedLimitInformation,
+                ctypes.byref(info), ctypes.sizeof(info)
+            ):
+                raise ctypes.WinError(ctypes.get_last_error())
+            process = _kernel32.OpenProcess(_PROCESS_SET_QUOTA | _PROCESS_TERMINATE, False, pid)
+            if not process:
+                raise ctypes.WinError(ctypes.get_last_error())
+            try:
+                if not _kernel32.AssignProcessToJobObject(wintypes.HANDLE(job), wintypes.HANDLE(process)):
+                    raise ctypes.WinError(ctypes.get_last_error())
+            finally:
+                _kernel32.CloseHandle(wintypes.HANDLE(process))
+        except OSError:
+            _kernel32.CloseHandle(wintypes.HANDLE(job))
+            raise
+        return job
+
+def _spawn(name, cmd, **kwargs):
+    """Popen a child as the leader of its own kill group and register it."""
+    if sys.platform == 'win32':
+        # Start suspended so the child is in its job before it can spawn
+        # anything (npm -> node/vite) that would otherwise escape it
+        kwargs["creationflags"] = (
+            subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW | _CREATE_SUSPENDED
+        )
+    else:
+        # A new session (not just a process group) detaches the child from
+        # the controlling terminal, so npm/Vite touching the TTY cannot get
+        # it stopped with SIGTTIN/SIGTTOU when launched from a shell
+        kwargs["start_new_session"] = True
+    
+    p = subprocess.Popen(cmd, **kwargs)
+    if sys.platform == 'win32':
+        try:
+            group = _create_kill_job(p.pid)
+        except OSError as e:
+            p.kill()
+            raise RuntimeError(f"Could not attach {name} to a kill-on-close job object: {e}") from e
+        psutil.Process(p.pid).resume()
+    else:
+        group = os.getpgid(p.pid)
+    _children.append((name, p, group))
+    return p
+
+def stop_children():
+    """Terminate every spawned child together with all of its descendants."""
+    while _children:
+        name, p, group = _children.pop()
+        print(f"Stopping {name}...")
+        try:
+            if sys.platform == 'win32':
+                # Kill-on-close: the kernel reaps the whole tree
+                _kernel32.CloseHandle(wintypes.HANDLE(group))
+            else:
+                os.killpg(group, signal.SIGTERM)
+                try:
+                    p.wait(timeout=SHUTDOWN_GRACE)
+                except subprocess.TimeoutExpired:
+                    pass
+                # Grandchildren may outlive the leader; sweep the group
+                os.killpg(group, signal.SIGKILL)
+        except ProcessLookupError:
+            pass # Group already gone
+        except Exception as e:
+            print(f"Error stopping {name}: {e}")
+
+# Set once a termination signal has started the shutdown
+_shutdown_requested = threading.Event()
+
+def _shutdown(signum, frame):
+    """SIGTERM/SIGINT handler: reap all children, then leave the launcher."""
+    if _shutdown_requested.is_set():
+        return
+    _shutdown_requested.set()
+    print(f"\nReceived signal {signum}, shutting down all services...")
+    stop_children()
+    sys.exit(0)
+
+def install_shutdown_handlers():
+    """Make sure children die with the launcher however it is stopped."""
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    # Covers normal interpreter exit paths that skip run_desktop's finally
+    atexit.register(stop_children)
+
+def kill_ports(ports):
+    """Kill processes listening on any of the given ports (one socket-table scan)."""
+    try:
+        pids = {
+            conn.pid for conn in psutil.net_connections(kind='inet')
+            if conn.pid and conn.laddr and conn.laddr.port in ports and conn.status == psutil.CONN_LISTEN
+        }
+    except psutil.AccessDenied as e:
+        print(f"Error scanning ports {sorted(ports)}: {e}")
+        return
+    
+    procs = []
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            print(f"Cleaning up stale listener (killing PID {pid}, {proc.name()})...")
+            proc.terminate()
+            procs.append(proc)
+        except psutil.NoSuchProcess:
+            pass # Already exited
+        except Exception as e:
+            print(f"Error killing PID {pid}: {e}")
+    
+    # One shared 1 s grace period for all of them, then force the rest
+    _, alive = psutil.wait_procs(procs, timeout=1)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+def _child_output(log_name):
+    """Unbuffered binary log file in verbose mode, otherwise the null device."""
+    if VERBOSE:
+        return open(ROOT_DIR / "desktop" / log_name, "wb", buffering=0)
+    return subprocess.DEVNULL
+
+def _listen_socket(port):
+    """A bound, listening localhost socket the backend child can inherit."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", port))
+    sock.listen(128)
+    sock.set_inheritable(True)
+    return sock
+
+def start_backend_services(local_port=8000, ai_port=8001):
+    """Run the Local and AI services in one uvicorn process (shared imports)."""
+    print(f"Starting Local Service on port {local_port} and AI Service on port {ai_port}...")
+    output = _child_output("backend.log")
+    
+    # Use sys.executable to ensure it uses the current env
+    cmd = [sys.executable, str(ROOT_DIR / "backend" / "launcher.py")]
+    if not VERBOSE:
+        # Skip per-request access-log formatting nobody reads
+        cmd += ["--no-access-log", "--log-level", "warning"]
+    # The Local Service resolves data/ and uploads/ relative to its folder
+    cwd = ROOT_DIR / "backend" / "local_service"
+    
+    if sys.platform == 'win32':
+        # Inherited socket handles can't be adopted via uvicorn --fd here
+        cmd += ["--host", "127.0.0.1", "--local-port", str(local_port), "--ai-port", str(ai_port)]
+        return _spawn("Backend Services", cmd, cwd=cwd, stdout=output, stderr=output)
+    
+    # Listen before the child starts: connections queue in the backlog
+    # instead of being refused while the services import
+    sockets = [_listen_socket(local_port), _listen_socket(ai_port)]
     try:
-        if sys.platform == 'win32':
-            # findstr returns exit code 1 if not found, check_output raises CalledProcessError
-            output = subprocess.check_output(f"netstat -ano | findstr :{port}", shell=True).decode()
-            for line in output.splitlines():
-                if "LISTENING" in line:
-                    pid = line.strip().split()[-1]
-                    print(f"Cleaning up port {port} (killing PID {pid})...")
-                    subprocess.run(f"taskkill /F /PID {pid}", shell=True, capture_output=True)
-    except subprocess.CalledProcessError:
-        pass # Port not in use
-    except Exception as e:
-        print(f"Error killing port {port}: {e}")
-
-def start_backend_service(name, folder, port):
-    """Run a FastAPI service using uvicorn."""
-    kill_port_process(port)
-    print(f"Starting {name} on port {port}...")
-    log_file = open(ROOT_DIR / "desktop" / f"{name.lower().replace(' ', '_')}.log", "w")
-    
-    # Use 'python -m uvicorn' to ensure it uses the current env
-    cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)]
-    cwd = ROOT_DIR / "backend" / folder
-    
-    return subprocess.Popen(cmd, cwd=cwd, stdout=log_file, stderr=log_file)
+        fds = [sock.fileno() for sock in sockets]
+        cmd += ["--local-fd", str(fds[0]), "--ai-fd", str(fds[1])]
+        return _spawn("Backend Services", cmd, cwd=cwd, stdout=output, stderr=output, pass_fds=fds)
+    finally:
+        # The child holds its own copies
+        for sock in sockets:
+            sock.close()
 
 def start_frontend_service():
     """Start Vite dev server."""
-    # Common Vite ports
-    for port in [5173, 5174, 5175]:
-        kill_port_process(port)
-        
     print("Starting Vite frontend...")
     cwd = ROOT_DIR / "frontend"
     
@@ -54,7 +276,7 @@ def start_frontend_service():
     
     # Use shell=True for npm on Windows
     cmd = "npm run dev"
-    return subprocess.Popen(cmd, cwd=cwd, shell=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return _spawn("Frontend", cmd, cwd=cwd, shell=True, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 def start_scroll_monitor():
     """Start the floating R indicator overlay."""
@@ -66,30 +288,55 @@ def start_scroll_monitor():
         print(f"Warning: Floating indicator not found at {indicator_path}")
         return None
     
-    log_file = open(ROOT_DIR / "desktop" / "scroll_monitor.log", "w")
+    output = _child_output("scroll_monitor.log")
     cmd = [sys.executable, str(indicator_path)]
     
-    return subprocess.Popen(cmd, cwd=overlay_dir, stdout=log_file, stderr=log_file)
+    return _spawn("Scroll Monitor", cmd, cwd=overlay_dir, stdout=output, stderr=output)
+
+def probe_url(url, method="GET"):
+    """Return True if url answers 200 within PROBE_TIMEOUT."""
+    try:
+        return _probe_session.request(method, url, timeout=PROBE_TIMEOUT).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+def _probe_head(url):
+    return probe_url(url, "HEAD")
+
+def _vite_ports():
+    """VITE_PORTS with the port remembered from the last launch first."""
+    try:
+        last = int(LAST_VITE_PORT_FILE.read_text())
+    except (OSError, ValueError):
+        return VITE_PORTS
+    return [last] + [port for port in VITE_PORTS if port != last]
 
 def get_frontend_url(timeout=30):
     """Wait for Vite to start and return the URL it's using."""
     print("Waiting for frontend to be ready...")
     start_time = time.time()
-    # Vite usually uses 5173 or 5174
-    ports = [5173, 5174, 5175]
+    ports = _vite_ports()
     
-    while time.time() - start_time < timeout:
-        for port in ports:
-            url = f"http://localhost:{port}"
-            try:
-                # Use a small timeout for the request itself
-                response = requests.get(url, timeout=0.5)
-                if response.status_code == 200:
+    pool = ThreadPoolExecutor(max_workers=len(ports))
+    try:
+        while time.time() - start_time < timeout:
+            # HEAD all candidate ports at once and take whichever answers first
+            futures = {pool.submit(_probe_head, f"http://localhost:{port}"): port for port in ports}
+            for future in as_completed(futures):
+                if future.result():
+                    port = futures[future]
+                    url = f"http://localhost:{port}"
                     print(f"Frontend detected at {url}")
+                    try:
+                        LAST_VITE_PORT_FILE.parent.mkdir(parents=True, exist_ok=True)
+                        LAST_VITE_PORT_FILE.write_text(str(port))
+                    except OSError:
+                        pass
                     return url
-            except requests.exceptions.ConnectionError:
-                continue
-        time.sleep(1)
+            time.sleep(PROBE_INTERVAL)
+    finally:
+        # Don't wait for probes of the ports that lost the race
+        pool.shutdown(wait=False)
     
     # Fallback to default
     print("Timed out waiting for frontend. Falling back to http://localhost:5173")
@@ -100,21 +347,21 @@ def wait_for_backend(ports, timeout=30):
     print(f"Waiting for backend services on ports {ports}...")
     start_time = time.time()
     pending_ports = list(ports)
+    # Try health endpoint for AI service, root for local service
+    urls = {
+        port: f"http://127.0.0.1:{port}{'/api/ai/health' if port == 8001 else '/api/topics'}"
+        for port in ports
+    }
     
-    while time.time() - start_time < timeout and pending_ports:
-        for port in list(pending_ports):
-            # Try health endpoint for AI service, root for local service
-            endpoint = "/api/ai/health" if port == 8001 else "/api/topics"
-            url = f"http://127.0.0.1:{port}{endpoint}"
-            try:
-                response = requests.get(url, timeout=1)
-                if response.status_code == 200:
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        while time.time() - start_time < timeout and pending_ports:
+            results = pool.map(probe_url, [urls[port] for port in pending_ports])
+            for port, ok in list(zip(pending_ports, results)):
+                if ok:
                     print(f"Service on port {port} is healthy!")
                     pending_ports.remove(port)
-            except requests.exceptions.ConnectionError:
-                continue
-        if pending_ports:
-            time.sleep(1)
+            if pending_ports:
+                time.sleep(PROBE_INTERVAL)
             
     if pending_ports:
         print(f"Warning: Timed out waiting for ports {pending_ports}. Services might still be starting.")
@@ -122,11 +369,20 @@ def wait_for_backend(ports, timeout=30):
         print("All backend services are ready.")
 
 def run_desktop():
-    # 1. Start all processes
-    local_process = start_backend_service("Local Service", "local_service", 8000)
-    ai_process = start_backend_service("AI Service", "ai_service", 8001)
-    frontend_process = start_frontend_service()
-    scroll_monitor_process = start_scroll_monitor()
+    # 0. Children must never outlive the launcher
+    install_shutdown_handlers()
+    
+    # 1. Free our ports from a previous run, then start all processes
+    kill_ports(SERVICE_PORTS)
+    launches = [
+        (start_backend_services, ()),
+        (start_frontend_service, ()),
+        (start_scroll_monitor, ()),
+    ]
+    # Process creation releases the GIL, so the spawns overlap
+    with ThreadPoolExecutor(max_workers=len(launches)) as pool:
+        for future in [pool.submit(fn, *args) for fn, args in launches]:
+            future.result()
     
     # 2. Wait for services to be ready
     wait_for_backend([8000, 8001])
@@ -144,27 +400,13 @@ def run_desktop():
     )
     
     try:
-        webview.start(debug=False)
+        # gui=None lets pywebview pick the best backend (Edge WebView2 on Windows)
+        webview.start(debug=DEBUG, gui=None)
     finally:
         print("\nShutting down all services...")
-        # Gracefully stop processes
-        # On Windows, we need to kill the process tree for npm/vite
-        processes = [
-            ("Local", local_process), 
-            ("AI", ai_process), 
-            ("Frontend", frontend_process),
-            ("Scroll Monitor", scroll_monitor_process)
-        ]
-        
-        for name, p in processes:
-            if p:
-                print(f"Stopping {name}...")
-                if sys.platform == 'win32':
-                    # Use taskkill /T to kill the process tree (important for Vite)
-                    subprocess.run(f"taskkill /F /T /PID {p.pid}", shell=True, capture_output=True)
-                else:
-                    p.terminate()
-        
+        # Each child leads its own kill group, so uvicorn workers and the
+        # node process behind npm/cmd.exe go down with it
+        stop_children()
         print("Done.")
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
 
 LOCAL_URL = "http://localhost:8010"
+
+# One keep-alive connection pool for every request in this script
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
 TOPIC = "IssueReproTopic"
 
 def reproduce():
@@ -16,7 +21,7 @@ def reproduce():
         with open("dummy.txt", "rb") as f:
             files = {'files': ("dummy.txt", f, "text/plain")}
             data = {'topic': TOPIC}
-            r = requests.post(f"{LOCAL_URL}/api/upload-materials", files=files, data=data)
+            r = SESSION.post(f"{LOCAL_URL}/api/upload-materials", files=files, data=data)
             r.raise_for_status()
             print("Upload success.")
     except Exception as e:
@@ -24,7 +29,7 @@ def reproduce():
 
     # 2. Check if roadmap exists (Expect 404 since we didn't generate it)
     print("2. Checking roadmap (Expect 404)...")
-    r = requests.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
+    r = SESSION.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
     print(f"Roadmap status: {r.status_code}")
     if r.status_code == 404:
         print("Confirmed: Roadmap not found as expected (user scenario).")
@@ -38,7 +43,7 @@ def reproduce():
         }
     }
     try:
-        r = requests.post(f"{LOCAL_URL}/api/roadmaps", json={
+        r = SESSION.post(f"{LOCAL_URL}/api/roadmaps", json={
             "topic": TOPIC,
             "roadmap": dummy_roadmap
         })
@@ -50,7 +55,7 @@ def reproduce():
     # 4. Test Get Roadmap (Simulate UI view)
     print("4. Testing Get Roadmap...")
     try:
-        r = requests.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
+        r = SESSION.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
         r.raise_for_status()
         data = r.json()
         print(f"Retrieved roadmap: {data}")
@@ -64,7 +69,7 @@ def reproduce():
     # 5. Try to delete topic
     print("5. Deleting topic...")
     try:
-        r = requests.delete(f"{LOCAL_URL}/api/topics/{TOPIC}")
+        r = SESSION.delete(f"{LOCAL_URL}/api/topics/{TOPIC}")
         print(f"Delete Status: {r.status_code}")
         print(f"Delete Content: {r.text}")
         r.raise_for_status()
@@ -76,4 +81,7 @@ def reproduce():
         os.remove("dummy.txt")
 
 if __name__ == "__main__":
-    reproduce()
+    try:
+        reproduce()
+    finally:
+        SESSION.close()
@@ -1,27 +1,38 @@
-import requests
-import time
+import asyncio
+import httpx
 import os
+import tempfile
 
 LOCAL_URL = os.getenv("LOCAL_URL", "http://localhost:8000")
 AI_URL = os.getenv("AI_URL", "http://localhost:8001")
 
-# Create a dummy PDF file
-with open("test_roadmap.pdf", "wb") as f:
-    f.write(b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Resources <<\n/Font <<\n/F1 4 0 R\n>>\n>>\n/Contents 5 0 R\n>>\nendobj\n4 0 obj\n<<\n/Type /Font\n/Subtype /Type1\n/BaseFont /Helvetica\n>>\nendobj\n5 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 24 Tf\n100 700 Td\n(Machine Learning Basics and Advanced Topics) Tj\nET\nendstream\nendobj\nxref\n0 6\n0000000000 65535 f\n0000000010 00000 n\n0000000060 00000 n\n0000000157 00000 n\n0000000305 00000 n\n0000000392 00000 n\ntrailer\n<<\n/Size 6\n/Root 1 0 R\n>>\nstartxref\n486\n%%EOF")
+# Minimal one-page PDF uploaded as study material
+PDF_BYTES = b"%PDF-1.4\n1 0 obj\n<<\n/Type /Catalog\n/Pages 2 0 R\n>>\nendobj\n2 0 obj\n<<\n/Type /Pages\n/Kids [3 0 R]\n/Count 1\n>>\nendobj\n3 0 obj\n<<\n/Type /Page\n/Parent 2 0 R\n/MediaBox [0 0 612 792]\n/Resources <<\n/Font <<\n/F1 4 0 R\n>>\n>>\n/Contents 5 0 R\n>>\nendobj\n4 0 obj\n<<\n/Type /Font\n/Subtype /Type1\n/BaseFont /Helvetica\n>>\nendobj\n5 0 obj\n<<\n/Length 44\n>>\nstream\nBT\n/F1 24 Tf\n100 700 Td\n(Machine Learning Basics and Advanced Topics) Tj\nET\nendstream\nendobj\nxref\n0 6\n0000000000 65535 f\n0000000010 00000 n\n0000000060 00000 n\n0000000157 00000 n\n0000000305 00000 n\n0000000392 00000 n\ntrailer\n<<\n/Size 6\n/Root 1 0 R\n>>\nstartxref\n486\n%%EOF"
 
 TOPIC = "ML_Test_Topic"
 FOCUS = "Neural Networks"
 
-def verify():
+async def verify():
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(PDF_BYTES)
+        pdf_path = tmp.name
+    try:
+        # One keep-alive client for the whole run; independent checks share it concurrently
+        async with httpx.AsyncClient(base_url=LOCAL_URL, timeout=60) as client:
+            await run_flow(client, pdf_path)
+    finally:
+        os.unlink(pdf_path)
+
+async def run_flow(client, pdf_path):
     print("--- Starting Verification ---")
     
     # 1. Upload Material
     print("\n1. Uploading material...")
-    with open("test_roadmap.pdf", "rb") as f:
+    with open(pdf_path, "rb") as f:
         files = {'files': ("test_roadmap.pdf", f, "application/pdf")}
         data = {'topic': TOPIC}
         try:
-            r = requests.post(f"{LOCAL_URL}/api/upload-materials", files=files, data=data)
+            r = await client.post("/api/upload-materials", files=files, data=data)
             r.raise_for_status()
             print("Upload success.")
         except Exception as e:
@@ -37,7 +48,7 @@ def verify():
         "prerequisites_unknown": ["Python"]
     }
     try:
-        r = requests.post(f"{LOCAL_URL}/api/planning", json=payload, timeout=60)
+        r = await client.post("/api/planning", json=payload)
         r.raise_for_status()
         roadmap_data = r.json()
         print("Roadmap received.")
@@ -59,7 +70,7 @@ def verify():
     # 3. Save Roadmap
     print("\n3. Saving Roadmap...")
     try:
-        r = requests.post(f"{LOCAL_URL}/api/roadmaps", json={
+        r = await client.post("/api/roadmaps", json={
             "topic": TOPIC,
             "roadmap": real_roadmap
         })
@@ -69,11 +80,17 @@ def verify():
         print(f"Save failed: {e}")
         return
 
-    # 4. List Topics
-    print("\n4. Listing Topics...")
+    # 4 + 5. List Topics and Fetch Roadmap (independent, run together)
+    print("\n4. Listing Topics / 5. Fetching Roadmap...")
+    topics_r, roadmap_r = await asyncio.gather(
+        client.get("/api/topics"),
+        client.get(f"/api/roadmaps/{TOPIC}"),
+        return_exceptions=True
+    )
     try:
-        r = requests.get(f"{LOCAL_URL}/api/topics")
-        topics = r.json()["topics"]
+        if isinstance(topics_r, Exception):
+            raise topics_r
+        topics = topics_r.json()["topics"]
         print(f"Topics: {topics}")
         if TOPIC in topics:
             print("SUCCESS: Topic found in list.")
@@ -82,12 +99,11 @@ def verify():
     except Exception as e:
          print(f"List failed: {e}")
 
-    # 5. Get Roadmap
-    print("\n5. Fetching Roadmap...")
     try:
-        r = requests.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
-        r.raise_for_status()
-        fetched = r.json()["roadmap"]
+        if isinstance(roadmap_r, Exception):
+            raise roadmap_r
+        roadmap_r.raise_for_status()
+        fetched = roadmap_r.json()["roadmap"]
         if fetched == real_roadmap:
              print("SUCCESS: Roadmap fetched correctly.")
         else:
@@ -98,7 +114,7 @@ def verify():
     # 6. Delete Topic
     print("\n6. Deleting Topic...")
     try:
-        r = requests.delete(f"{LOCAL_URL}/api/topics/{TOPIC}")
+        r = await client.delete(f"/api/topics/{TOPIC}")
         r.raise_for_status()
         print(r.json())
         print("Delete request successful.")
@@ -108,25 +124,23 @@ def verify():
     # 7. Verify Deletion
     print("\n7. Verifying Deletion...")
     try:
-        r = requests.get(f"{LOCAL_URL}/api/topics")
-        topics = r.json()["topics"]
+        topics_r, roadmap_r = await asyncio.gather(
+            client.get("/api/topics"),
+            client.get(f"/api/roadmaps/{TOPIC}")
+        )
+        topics = topics_r.json()["topics"]
         if TOPIC not in topics:
             print("SUCCESS: Topic gone from list.")
         else:
             print("FAILURE: Topic still in list.")
             
-        r = requests.get(f"{LOCAL_URL}/api/roadmaps/{TOPIC}")
-        if r.status_code == 404:
+        if roadmap_r.status_code == 404:
             print("SUCCESS: Roadmap 404s.")
         else:
-            print(f"FAILURE: Roadmap still exists (status {r.status_code}).")
+            print(f"FAILURE: Roadmap still exists (status {roadmap_r.status_code}).")
             
     except Exception as e:
         print(f"Verify delete failed: {e}")
 
-    # Cleanup
-    if os.path.exists("test_roadmap.pdf"):
-        os.remove("test_roadmap.pdf")
-
 if __name__ == "__main__":
-    verify()
+    asyncio.run(verify())
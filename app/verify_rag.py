@@ -1,4 +1,5 @@
-import requests
+import asyncio
+import httpx
 import json
 import time
 
@@ -11,48 +12,11 @@ def print_result(step, success, details=""):
     if details:
         print(f"   {details}")
 
-def verify_rag():
-    print("Starting RAG Verification...")
-    
-    # 1. Check Index Stats (Local Service)
-    try:
-        resp = requests.get(f"{LOCAL_SERVICE}/api/tools/index_stats")
-        if resp.status_code == 200:
-            stats = resp.json()
-            print_result("Check Index Stats", True, f"Total Vectors: {stats.get('total_vectors')}")
-        else:
-            print_result("Check Index Stats", False, f"Status: {resp.status_code}")
-            return
-    except Exception as e:
-        print_result("Check Index Stats", False, str(e))
-        return
-
-    # 2. Upload and Index File (Local Service)
-    test_content = """
-    Resolut Learning Assistant is a cool project.
-    It uses a local RAG architecture.
-    The embeddings are generated on the device using sentence-transformers.
-    This ensures user privacy.
-    """
-    files = {'files': ('test_doc.txt', test_content, 'text/plain')}
-    data = {'topic': 'resolut-architecture'}
-    
-    try:
-        resp = requests.post(f"{LOCAL_SERVICE}/api/upload-materials", files=files, data=data)
-        if resp.status_code == 200:
-            result = resp.json()
-            print_result("Upload & Index", True, f"Indexed: {result.get('message')}")
-        else:
-            print_result("Upload & Index", False, resp.text)
-            return
-    except Exception as e:
-        print_result("Upload & Index", False, str(e))
-        return
-
+async def check_search(client):
     # 3. Verify Search Tool (Local Service direct call)
     search_payload = {"query": "local RAG architecture", "top_k": 2}
     try:
-        resp = requests.post(f"{LOCAL_SERVICE}/api/tools/search_knowledge_base", json=search_payload)
+        resp = await client.post(f"{LOCAL_SERVICE}/api/tools/search_knowledge_base", json=search_payload)
         if resp.status_code == 200:
             data = resp.json()
             results = data.get("results", [])
@@ -63,6 +27,7 @@ def verify_rag():
     except Exception as e:
         print_result("Direct Search Tool", False, str(e))
 
+async def check_ai_agent(client):
     # 4. Verify AI Service Tool Use (AI Service -> Local Tool)
     # The AI service should call back to the local service using the provided URL
     ai_payload = {
@@ -73,7 +38,7 @@ def verify_rag():
     
     try:
         print("   Calling AI Service (this might take a moment if it runs inference)...")
-        resp = requests.post(f"{AI_SERVICE}/api/ai/prerequisites", json=ai_payload)
+        resp = await client.post(f"{AI_SERVICE}/api/ai/prerequisites", json=ai_payload)
         
         if resp.status_code == 200:
             data = resp.json()
@@ -87,5 +52,48 @@ def verify_rag():
     except Exception as e:
         print_result("AI Agent RAG", False, str(e))
 
+async def verify_rag():
+    print("Starting RAG Verification...")
+    
+    # One keep-alive client for the whole run (AI inference can be slow)
+    async with httpx.AsyncClient(timeout=120) as client:
+        # 1. Check Index Stats (Local Service)
+        try:
+            resp = await client.get(f"{LOCAL_SERVICE}/api/tools/index_stats")
+            if resp.status_code == 200:
+                stats = resp.json()
+                print_result("Check Index Stats", True, f"Total Vectors: {stats.get('total_vectors')}")
+            else:
+                print_result("Check Index Stats", False, f"Status: {resp.status_code}")
+                return
+        except Exception as e:
+            print_result("Check Index Stats", False, str(e))
+            return
+
+        # 2. Upload and Index File (Local Service)
+        test_content = """
+        Resolut Learning Assistant is a cool project.
+        It uses a local RAG architecture.
+        The embeddings are generated on the device using sentence-transformers.
+        This ensures user privacy.
+        """
+        files = {'files': ('test_doc.txt', test_content, 'text/plain')}
+        data = {'topic': 'resolut-architecture'}
+        
+        try:
+            resp = await client.post(f"{LOCAL_SERVICE}/api/upload-materials", files=files, data=data)
+            if resp.status_code == 200:
+                result = resp.json()
+                print_result("Upload & Index", True, f"Indexed: {result.get('message')}")
+            else:
+                print_result("Upload & Index", False, resp.text)
+                return
+        except Exception as e:
+            print_result("Upload & Index", False, str(e))
+            return
+
+        # 3 + 4. Both only need the indexed document, so run them together
+        await asyncio.gather(check_search(client), check_ai_agent(client))
+
 if __name__ == "__main__":
-    verify_rag()
+    asyncio.run(verify_rag())
@@ -1,4 +1,5 @@
 import os
+import hashlib
 import subprocess
 import shutil
 import sys
@@ -11,18 +12,37 @@ FRONTEND_DIR = APP_DIR / "frontend"
 OVERLAY_DIR = ROOT_DIR / "overlay"
 DIST_DIR = ROOT_DIR / "dist"
 BUILD_DIR = ROOT_DIR / "build"
+SPEC_FILE = ROOT_DIR / "Resolut.spec"
+LOCK_FILE = FRONTEND_DIR / "package-lock.json"
+LOCK_HASH_FILE = BUILD_DIR / ".lockhash"
 
-def run_command(cmd, cwd=None, shell=True):
+# Optional directory holding the upx binary (e.g. /opt/upx)
+UPX_DIR = os.getenv("UPX_DIR")
+
+def run_command(cmd, cwd=None, shell=True, env=None):
     print(f"Executing: {cmd} in {cwd or os.getcwd()}")
-    result = subprocess.run(cmd, cwd=cwd, shell=shell)
+    result = subprocess.run(cmd, cwd=cwd, shell=shell, env=env)
     if result.returncode != 0:
         print(f"Error executing command: {cmd}")
         sys.exit(1)
 
+def npm_env():
+    """Environment with a persistent npm cache so `npm ci` can stay offline."""
+    if sys.platform == 'win32':
+        cache = Path(os.environ.get("LOCALAPPDATA", Path.home())) / "npm-cache"
+    else:
+        cache = Path.home() / ".npm"
+    return {**os.environ, "NPM_CONFIG_CACHE": str(cache)}
+
 def build_frontend():
     print("\n--- Building Frontend ---")
-    if not (FRONTEND_DIR / "node_modules").exists():
-        run_command("npm install", cwd=FRONTEND_DIR)
+    # Reinstall only when the lockfile changed since the last install
+    lock_hash = hashlib.sha256(LOCK_FILE.read_bytes()).hexdigest()
+    installed_hash = LOCK_HASH_FILE.read_text().strip() if LOCK_HASH_FILE.exists() else None
+    if not (FRONTEND_DIR / "node_modules").exists() or installed_hash != lock_hash:
+        run_command("npm ci --prefer-offline --no-audit --no-fund --loglevel=error", cwd=FRONTEND_DIR, env=npm_env())
+        BUILD_DIR.mkdir(parents=True, exist_ok=True)
+        LOCK_HASH_FILE.write_text(lock_hash)
     run_command("npm run build", cwd=FRONTEND_DIR)
 
 def bundle_executable():
@@ -35,28 +55,22 @@ def bundle_executable():
         print("PyInstaller not found. Installing...")
         run_command(f"{sys.executable} -m pip install pyinstaller")
 
-    # Main entry point is the scroll monitor (which launches the rest)
-    entry_point = OVERLAY_DIR / "scroll_monitor_main.py"
-    
-    # Build the command
+    # Entry point, excludes, strip and UPX settings live in the committed
+    # spec (onedir build with scroll_monitor_main.py launching the rest).
+    # No --clean, so PyInstaller reuses its analysis cache under build/.
     cmd = [
         "pyinstaller",
-        "--noconsole",
-        "--name=Resolut",
-        f"--paths={ROOT_DIR}",
-        f"--add-data=\"{APP_DIR};app\"",
-        f"--add-data=\"{OVERLAY_DIR};overlay\"",
-        "--clean",
         "--noconfirm",
-        str(entry_point)
+        f"\"{SPEC_FILE}\""
     ]
+    if UPX_DIR:
+        cmd.insert(1, f"--upx-dir=\"{UPX_DIR}\"")
     
     run_command(" ".join(cmd), cwd=ROOT_DIR)
 
 def main():
-    # 1. Clean previous builds
+    # 1. Clean previous output (build/ is kept as PyInstaller's cache)
     if DIST_DIR.exists(): shutil.rmtree(DIST_DIR)
-    if BUILD_DIR.exists(): shutil.rmtree(BUILD_DIR)
     
     # 2. Build Frontend
     try:
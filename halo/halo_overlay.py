@@ -1,8 +1,9 @@
 import sys
 import signal
+import socket
 from PyQt6.QtWidgets import QApplication, QWidget
-from PyQt6.QtCore import Qt, QRectF, QTimer
-from PyQt6.QtGui import QPainter, QColor, QLinearGradient, QPen, QBrush
+from PyQt6.QtCore import Qt, QRectF, QSocketNotifier
+from PyQt6.QtGui import QPainter, QColor, QLinearGradient, QPen, QBrush, QPixmap
 
 class GeminiHalo(QWidget):
     def __init__(self):
@@ -17,40 +18,91 @@ class GeminiHalo(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
 
+        # Gemini Gradient stops and border width never change
+        self._thickness = 12
+        self._stops = [
+            (0.0, QColor(66, 133, 244)),
+            (0.3, QColor(34, 211, 238)),
+            (0.6, QColor(147, 197, 253)),
+            (1.0, QColor(29, 78, 216)),
+        ]
+
+        # Border geometry and pen (per size) and the pre-rendered border
+        self._rect = None
+        self._pen = None
+        self._cached = None
+
         self.showFullScreen()
 
+    def resizeEvent(self, event):
+        self._build_pen()
+        self._cached = None
+        super().resizeEvent(event)
+
+    def _build_pen(self):
+        thickness = self._thickness
+        self._rect = QRectF(thickness/2, thickness/2,
+                            self.width() - thickness, self.height() - thickness)
+
+        gradient = QLinearGradient(self._rect.topLeft(), self._rect.bottomRight())
+        gradient.setStops(self._stops)
+
+        self._pen = QPen(QBrush(gradient), thickness)
+        self._pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+
     def paintEvent(self, event):
+        if self._cached is None:
+            self._cached = self._render_border()
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._cached)
+
+    def _render_border(self):
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        if self._pen is None:
+            self._build_pen()
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self._pen)
+        painter.drawRect(self._rect)
+        painter.end()
+        return pixmap
 
-        thickness = 12
-        rect = QRectF(thickness/2, thickness/2,
-                      self.width() - thickness, self.height() - thickness)
+def install_sigint_quit(app):
+    """
+    Quit the app on Ctrl+C without a polling timer.
 
-        # Gemini Gradient
-        gradient = QLinearGradient(rect.topLeft(), rect.bottomRight())
-        gradient.setColorAt(0.0, QColor(66, 133, 244))
-        gradient.setColorAt(0.3, QColor(34, 211, 238))
-        gradient.setColorAt(0.6, QColor(147, 197, 253))
-        gradient.setColorAt(1.0, QColor(29, 78, 216))
+    Python writes a byte to the wakeup socket when a signal arrives; the
+    notifier wakes Qt's event loop, and running its slot lets the
+    interpreter run the SIGINT handler. A socket pair (rather than
+    os.pipe) is used because Windows only accepts sockets here.
+    """
+    rsock, wsock = socket.socketpair()
+    rsock.setblocking(False)
+    wsock.setblocking(False)
+    signal.set_wakeup_fd(wsock.fileno())
+    signal.signal(signal.SIGINT, lambda signum, frame: app.quit())
 
-        pen = QPen(QBrush(gradient), thickness)
-        pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+    def drain():
+        try:
+            rsock.recv(64)
+        except OSError:
+            pass
 
-        painter.setPen(pen)
-        painter.drawRect(rect)
+    notifier = QSocketNotifier(rsock.fileno(), QSocketNotifier.Type.Read, app)
+    notifier.activated.connect(drain)
+    # Keep the sockets alive as long as the app
+    app._sigint_wakeup = (rsock, wsock, notifier)
 
 if __name__ == "__main__":
-    # 1. Allow Ctrl+C to close the application
-    signal.signal(signal.SIGINT, signal.SIG_DFL)
-
     app = QApplication(sys.argv)
 
-    # 2. Use a timer to let the Python interpreter process signals
-    # Without this, the app stays alive even if you hit Ctrl+C in some terminals
-    timer = QTimer()
-    timer.start(500)  # Check every 500ms
-    timer.timeout.connect(lambda: None)
+    # Allow Ctrl+C to close the application
+    install_sigint_quit(app)
 
     window = GeminiHalo()
 
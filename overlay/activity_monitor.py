@@ -6,28 +6,199 @@ Monitors user activity and detects mindless social media scrolling.
 Tracks continuous social media usage time and triggers callbacks when thresholds are exceeded.
 """
 
+import ctypes
+import logging
 import time
 import threading
 import os
+import weakref
 import psutil
-import win32gui
-import win32process
-from collections import deque
+from ctypes import wintypes
+from collections import OrderedDict
+from functools import lru_cache
 from pynput import mouse, keyboard
-from typing import Callable, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 try:
     from .config import (
-        SOCIAL_MEDIA_KEYWORDS, BROWSER_PROCESSES,
-        SCROLL_DETECTION_THRESHOLD_MINUTES
+        SOCIAL_MEDIA_APPS_LC, SOCIAL_MEDIA_KEYWORDS_LC, BROWSER_PROCESSES_LC,
+        FEED_TITLE_PATTERNS_LC, SCROLL_DETECTION_THRESHOLD_MINUTES
     )
 except ImportError:
     from config import (
-        SOCIAL_MEDIA_KEYWORDS, BROWSER_PROCESSES,
-        SCROLL_DETECTION_THRESHOLD_MINUTES
+        SOCIAL_MEDIA_APPS_LC, SOCIAL_MEDIA_KEYWORDS_LC, BROWSER_PROCESSES_LC,
+        FEED_TITLE_PATTERNS_LC, SCROLL_DETECTION_THRESHOLD_MINUTES
     )
 
 
+# Per-tick state trace. The level is left to the application: at the
+# default WARNING each log.debug call is a cheap level check, and nothing
+# is formatted unless DEBUG is enabled for this logger
+log = logging.getLogger("overlay.monitor")
+
+
+# Foreground-window -> process lookups are reused for this long (seconds),
+# for at most this many distinct windows
+HWND_CACHE_TTL = 30.0
+HWND_CACHE_SIZE = 64
+
+# Poll interval (seconds): fast while the user is active, backing off
+# exponentially to the idle maximum, and fastest just before the threshold
+POLL_INTERVAL_ACTIVE = 0.25
+POLL_INTERVAL_IDLE_MAX = 2.0
+POLL_INTERVAL_NEAR_THRESHOLD = 0.1
+
+# Slots in each listener -> monitor event ring (power of two)
+EVENT_RING_SIZE = 4096
+
+# Direct user32 bindings for the per-tick foreground queries: no pywin32
+# wrapper objects, and the out-buffers are reused across ticks
+_user32 = ctypes.WinDLL("user32")
+_user32.GetForegroundWindow.restype = wintypes.HWND
+_user32.GetWindowTextLengthW.argtypes = (wintypes.HWND,)
+_user32.GetWindowTextW.argtypes = (wintypes.HWND, wintypes.LPWSTR, ctypes.c_int)
+_user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, ctypes.POINTER(wintypes.DWORD))
+_user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+
+# Thread-local, since every monitor instance polls from its own thread
+_buffers = threading.local()
+
+
+def _get_foreground_snapshot() -> Tuple[int, str]:
+    """(hwnd, title) of the foreground window; hwnd is 0 when there is none."""
+    hwnd = _user32.GetForegroundWindow()
+    if not hwnd:
+        return 0, ""
+    length = _user32.GetWindowTextLengthW(hwnd)
+    title_buf = getattr(_buffers, "title", None)
+    if title_buf is None or length >= len(title_buf):
+        title_buf = _buffers.title = ctypes.create_unicode_buffer(max(length + 1, 512))
+    length = _user32.GetWindowTextW(hwnd, title_buf, len(title_buf))
+    return hwnd, title_buf[:length]
+
+
+def _get_window_pid(hwnd: int) -> int:
+    """Id of the process owning a window (0 if the window is gone)."""
+    pid_buf = getattr(_buffers, "pid", None)
+    if pid_buf is None:
+        pid_buf = _buffers.pid = wintypes.DWORD()
+    pid_buf.value = 0
+    _user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid_buf))
+    return pid_buf.value
+
+
+def _build_classifier():
+    """
+    Generate the (app, title) classifier with the configured lists inlined.
+
+    The lists are fixed for the life of the process, so each entry becomes a
+    literal `in` test in straight-line code: no loop, no attribute lookups,
+    and it beats a regex alternation on the common no-match title.
+    """
+    lines = [
+        "def _classify(app_lower, title_lower):",
+        # Explicit ignore for the agent's process OR IDE
+        "    if 'antigravity' in app_lower or 'code.exe' in app_lower or 'python.exe' in app_lower:",
+        "        return False, ''",
+    ]
+    # 1. Check if the app itself is a known social media app
+    for sm_app in SOCIAL_MEDIA_APPS_LC:
+        lines.append(f"    if {sm_app!r} in app_lower: return True, {'app:' + sm_app!r}")
+    # 2. If it's a browser, check the title for keywords, then feed patterns
+    lines.append(f"    if app_lower in {tuple(sorted(BROWSER_PROCESSES_LC))!r}:")
+    for kw in SOCIAL_MEDIA_KEYWORDS_LC:
+        lines.append(f"        if {kw!r} in title_lower: return True, {'keyword:' + kw!r}")
+    for pattern in FEED_TITLE_PATTERNS_LC:
+        lines.append(f"        if {pattern!r} in title_lower: return True, {'pattern:' + pattern!r}")
+    lines.append("    return False, ''")
+
+    namespace = {}
+    exec(compile("\n".join(lines), "<activity_classifier>", "exec"), namespace)
+    return namespace["_classify"]
+
+
+# Memoized: the foreground title rarely changes between polls, so most
+# classifications are a single cache hit
+_classify_activity = lru_cache(maxsize=256)(_build_classifier())
+
+
+class _BucketCounter:
+    """
+    Sliding-window total over one-second buckets.
+
+    Adding and reading are O(1) amortized: a running sum is kept, and buckets
+    are only zeroed as the head second advances past them.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buckets = [0] * window
+        self.total = 0
+        self.head_sec = int(time.time())
+
+    def _advance(self, sec: int):
+        if sec <= self.head_sec:
+            return
+        if sec - self.head_sec >= self.window:
+            self.buckets = [0] * self.window
+            self.total = 0
+        else:
+            for s in range(self.head_sec + 1, sec + 1):
+                i = s % self.window
+                self.total -= self.buckets[i]
+                self.buckets[i] = 0
+        self.head_sec = sec
+
+    def add(self, now: float, amount: int = 1):
+        sec = int(now)
+        self._advance(sec)
+        # A timestamp behind the head (clock step) counts towards the head second
+        self.buckets[max(sec, self.head_sec) % self.window] += amount
+        self.total += amount
+
+    def sum(self, now: float) -> int:
+        self._advance(int(now))
+        return self.total
+
+
+class _EventRing:
+    """
+    Lockless single-producer/single-consumer ring of (timestamp, amount).
+
+    The input listener thread is the only writer and the monitor loop the
+    only reader. Each side advances its own index; slot writes land before
+    the write index moves, and the GIL makes both atomic.
+    """
+
+    def __init__(self, size: int = EVENT_RING_SIZE):
+        self.mask = size - 1
+        self.times = [0.0] * size
+        self.amounts = [0] * size
+        self.write = 0
+        self.read = 0
+
+    def push(self, now: float, amount: int = 1):
+        i = self.write & self.mask
+        self.times[i] = now
+        self.amounts[i] = amount
+        self.write += 1
+
+    @property
+    def last_time(self) -> float:
+        """Timestamp of the most recent event (0.0 if none yet)."""
+        write = self.write
+        return self.times[(write - 1) & self.mask] if write else 0.0
+
+    def drain_into(self, counter: "_BucketCounter"):
+        end = self.write
+        # On overrun only the newest full ring of events is still intact
+        start = max(self.read, end - self.mask)
+        for n in range(start, end):
+            i = n & self.mask
+            counter.add(self.times[i], self.amounts[i])
+        self.read = end
+
+
 class ActivityMonitor:
     """
     Monitors user activity to detect social media scrolling behavior.
@@ -35,10 +206,17 @@ class ActivityMonitor:
     Features:
     - Tracks scroll events and keyboard activity
     - Detects social media apps and browser tabs
-    - Calculates confidence score for "mindless scrolling"
+    - Reports per-minute scroll and key activity rates
     - Tracks continuous social media usage duration
     - Triggers callbacks when thresholds are exceeded
     """
+
+    # One pair of input hooks per process, fanned out to every started
+    # monitor. Each hook thread stays the single producer of every ring.
+    _instances: "weakref.WeakSet[ActivityMonitor]" = weakref.WeakSet()
+    _mouse_listener = None
+    _keyboard_listener = None
+    _listener_lock = threading.Lock()
     
     def __init__(self, averaging_window: int = 60):
         """
@@ -48,9 +226,20 @@ class ActivityMonitor:
             averaging_window: Window in seconds for calculating scroll/key rates
         """
         self.averaging_window = averaging_window
+        # Window totals -> per-minute rates
+        self._rate_scale = 60.0 / averaging_window
+
+        # Nudge threshold, and the point just before it, in seconds
+        self._threshold_secs = SCROLL_DETECTION_THRESHOLD_MINUTES * 60.0
+        self._near_threshold_secs = self._threshold_secs - 6.0
 
-        self.scroll_events = deque()
-        self.key_events = deque()
+        # Input listeners push into the rings without locking; the loop
+        # drains them once per tick into per-second counters over the
+        # averaging window (scroll distance / key presses)
+        self._scroll_ring = _EventRing()
+        self._key_ring = _EventRing()
+        self._scroll_counter = _BucketCounter(averaging_window)
+        self._key_counter = _BucketCounter(averaging_window)
 
         self.current_data = {}
         self.lock = threading.Lock()
@@ -61,29 +250,64 @@ class ActivityMonitor:
         self.continuous_social_duration: float = 0  # in seconds
         self.off_social_start_time: Optional[float] = None # Grace period tracking
         self.was_on_social_media: bool = False
+        self.last_state: str = "FOCUSED"
         
         # Self-identification to ignore self-focus
-        import os
         self.self_pid = os.getpid()
         
+        # hwnd -> (pid, app name, looked up at), LRU order
+        self._hwnd_cache: "OrderedDict[int, Tuple[int, str, float]]" = OrderedDict()
+        # pid -> (process handle, lowercase name); a process's name never changes
+        self._proc_cache: Dict[int, Tuple[psutil.Process, str]] = {}
+        
         # Callbacks
         self.on_threshold_exceeded: Optional[Callable[[float], None]] = None
         self.on_social_media_detected: Optional[Callable[[dict], None]] = None
         self.threshold_triggered: bool = False
+        # Called with the new state whenever current_data changes
+        self._data_listeners: List[Callable[[dict], None]] = []
+
+    def add_data_listener(self, callback: Callable[[dict], None]):
+        """Register a callback for state changes (called from the monitor thread)."""
+        self._data_listeners.append(callback)
+
+    def remove_data_listener(self, callback: Callable[[dict], None]):
+        if callback in self._data_listeners:
+            self._data_listeners.remove(callback)
 
     def start(self):
-        """Start monitoring user activity."""
+        """Start monitoring user activity (no-op if already running)."""
+        if self.running:
+            return
         self.running = True
         self.threshold_triggered = False
 
-        mouse.Listener(on_scroll=self._on_scroll).start()
-        keyboard.Listener(on_press=self._on_key).start()
+        cls = type(self)
+        with cls._listener_lock:
+            cls._instances.add(self)
+            if cls._mouse_listener is None:
+                cls._mouse_listener = mouse.Listener(on_scroll=cls._dispatch_scroll)
+                cls._mouse_listener.start()
+                cls._keyboard_listener = keyboard.Listener(on_press=cls._dispatch_key)
+                cls._keyboard_listener.start()
 
         threading.Thread(target=self._loop, daemon=True).start()
 
     def stop(self):
         """Stop monitoring."""
         self.running = False
+        with self._listener_lock:
+            self._instances.discard(self)
+
+    @classmethod
+    def _dispatch_scroll(cls, x, y, dx, dy):
+        for monitor in list(cls._instances):
+            monitor._on_scroll(x, y, dx, dy)
+
+    @classmethod
+    def _dispatch_key(cls, key):
+        for monitor in list(cls._instances):
+            monitor._on_key(key)
 
     def reset_duration(self):
         """Reset the continuous social media duration counter."""
@@ -99,146 +323,199 @@ class ActivityMonitor:
             return self.continuous_social_duration / 60
 
     def _on_scroll(self, x, y, dx, dy):
-        with self.lock:
-            self.scroll_events.append((time.time(), abs(dy)))
+        self._scroll_ring.push(time.time(), abs(dy))
 
     def _on_key(self, key):
-        with self.lock:
-            self.key_events.append(time.time())
+        self._key_ring.push(time.time())
 
-    def _is_social_media_active(self, app: str, title: str) -> (bool, str):
-        """Check if current activity is social media. Returns (bool, reason)."""
-        app_lower = app.lower()
-        title_lower = title.lower()
-        
-        # Explicit ignore for the agent's process OR IDE
-        if "antigravity" in app_lower or "code.exe" in app_lower or "python.exe" in app_lower:
-            return False, ""
-
-        # 1. Check if the app itself is a known social media app
-        from config import SOCIAL_MEDIA_APPS
-        for sm_app in SOCIAL_MEDIA_APPS:
-            if sm_app.lower() in app_lower:
-                return True, f"app:{sm_app}"
-        
-        # 2. If it's a browser, check the title for keywords/patterns
-        is_browser = False
-        for browser in BROWSER_PROCESSES:
-            if browser.lower() in app_lower:
-                is_browser = True
-                break
-        
-        if is_browser:
-            # Check keywords in title
-            for keyword in SOCIAL_MEDIA_KEYWORDS:
-                if keyword.lower() in title_lower:
-                    return True, f"keyword:{keyword}"
-            
-            # Check patterns in title
-            patterns = ["reels", "shorts", "explore", "trending", "feed", "timeline"]
-            for p in patterns:
-                if p in title_lower:
-                    return True, f"pattern:{p}"
-
-        return False, ""
+    def _drain_events(self):
+        """Fold pending listener events into the counters (call with the lock held)."""
+        self._scroll_ring.drain_into(self._scroll_counter)
+        self._key_ring.drain_into(self._key_counter)
+
+    def _is_social_media_active(self, app_lower: str, title_lower: str) -> (bool, str):
+        """
+        Check if current activity is social media. Returns (bool, reason).
+
+        Both arguments must already be lowercase: app names are lowercased
+        when looked up, titles once per tick in the loop.
+        """
+        return _classify_activity(app_lower, title_lower)
+
+    def _poll_interval(self, now: float, near_threshold: bool) -> float:
+        """Seconds to sleep before the next tick."""
+        if near_threshold:
+            return POLL_INTERVAL_NEAR_THRESHOLD
+        idle = now - max(self._scroll_ring.last_time, self._key_ring.last_time)
+        if idle < 2:
+            return POLL_INTERVAL_ACTIVE
+        return min(POLL_INTERVAL_IDLE_MAX, POLL_INTERVAL_ACTIVE * 2 ** min(3, int(idle) // 5))
+
+    def _get_app_name(self, pid: int) -> Optional[str]:
+        """Lowercase process name for a pid, reusing one psutil handle per process."""
+        cached = self._proc_cache.get(pid)
+        if cached is not None:
+            # is_running() also catches a recycled pid
+            if cached[0].is_running():
+                return cached[1]
+            del self._proc_cache[pid]
+
+        try:
+            proc = psutil.Process(pid)
+            app = proc.name().lower()
+        except psutil.NoSuchProcess:
+            return None
+        except psutil.AccessDenied:
+            return "unknown"
+
+        self._proc_cache[pid] = (proc, app)
+        if len(self._proc_cache) > HWND_CACHE_SIZE:
+            del self._proc_cache[next(iter(self._proc_cache))]
+        return app
+
+    def _lookup_window_process(self, hwnd: int, now: float) -> Tuple[int, str]:
+        """(pid, lowercase app name) owning a window, memoized per hwnd."""
+        cached = self._hwnd_cache.get(hwnd)
+        if cached is not None and now - cached[2] < HWND_CACHE_TTL and psutil.pid_exists(cached[0]):
+            self._hwnd_cache.move_to_end(hwnd)
+            return cached[0], cached[1]
+
+        pid = _get_window_pid(hwnd)
+        if pid <= 0:
+            return pid, ""
+
+        app = self._get_app_name(pid)
+        if app is None:
+            return pid, "unknown"
+
+        self._hwnd_cache[hwnd] = (pid, app, now)
+        self._hwnd_cache.move_to_end(hwnd)
+        if len(self._hwnd_cache) > HWND_CACHE_SIZE:
+            self._hwnd_cache.popitem(last=False)
+        return pid, app
 
     def _loop(self):
         """Main monitoring loop."""
         last_app = None
         app_start = time.time()
         last_debug_time = 0
+        # Foreground (hwnd, title) of the previous tick and what it resolved to
+        last_window = None
+        last_result = (0, "", False, "")
 
         while self.running:
             try:
                 now = time.time()
 
                 # Get foreground window info safely
-                hwnd = win32gui.GetForegroundWindow()
+                hwnd, title = _get_foreground_snapshot()
                 if not hwnd:
                     time.sleep(0.5)
                     continue
 
-                title = win32gui.GetWindowText(hwnd)
-                _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                
-                if pid <= 0:
-                    time.sleep(0.5)
-                    continue
+                window = (hwnd, title)
+                if window == last_window:
+                    # Same window, same title: the classification cannot differ
+                    pid, app, is_on_social, match_reason = last_result
+                else:
+                    pid, app = self._lookup_window_process(hwnd, now)
+                    
+                    if pid <= 0:
+                        time.sleep(0.5)
+                        continue
 
-                try:
-                    app = psutil.Process(pid).name().lower()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    app = "unknown"
+                    # Check if on social media
+                    is_on_social, match_reason = self._is_social_media_active(app, title.lower())
+                    last_window = window
+                    last_result = (pid, app, is_on_social, match_reason)
 
                 if app != last_app:
                     last_app = app
                     app_start = now
 
-                # Prune old events
-                with self.lock:
-                    while self.scroll_events and self.scroll_events[0][0] < now - self.averaging_window:
-                        self.scroll_events.popleft()
-                    while self.key_events and self.key_events[0] < now - self.averaging_window:
-                        self.key_events.popleft()
-
-                # Check if on social media
-                is_on_social, match_reason = self._is_social_media_active(app, title)
                 is_self = (pid == self.self_pid)
 
                 # Duration tracking with Grace Period (10s)
                 with self.lock:
+                    # Scroll distance / key presses per minute over the window
+                    self._drain_events()
+                    scrolls_per_min = round(self._scroll_counter.sum(now) * self._rate_scale)
+                    keys_per_min = round(self._key_counter.sum(now) * self._rate_scale)
+
+                    # Work on locals; write the session state back in one pass
+                    start = self.social_media_start_time
+                    off_start = self.off_social_start_time
+                    was_social = self.was_on_social_media
+                    duration = self.continuous_social_duration
+                    state = self.last_state
+
                     if is_on_social:
-                        if not self.was_on_social_media:
-                            self.social_media_start_time = now
-                            self.was_on_social_media = True
+                        if not was_social:
+                            start = now
+                            was_social = True
                         
-                        self.continuous_social_duration = now - (self.social_media_start_time or now)
-                        self.off_social_start_time = None
-                        self.last_state = f"ACTIVE ({match_reason})"
+                        duration = now - start
+                        off_start = None
+                        state = f"ACTIVE ({match_reason})"
                     
                     elif is_self:
-                        if self.was_on_social_media and self.social_media_start_time:
+                        if was_social and start:
                             # Limit self-focus maintenance to 1 minute
-                            if now - (self.off_social_start_time or now) < 60:
-                                self.continuous_social_duration = now - self.social_media_start_time
-                                self.last_state = "SELF-FOCUS (Persisted)"
+                            if off_start is None or now - off_start < 60:
+                                duration = now - start
+                                state = "SELF-FOCUS (Persisted)"
                     
+                    elif was_social:
+                        if off_start is None:
+                            off_start = now
+                        
+                        # Reduced grace period from 10s to 5s
+                        if now - off_start > 5:
+                            start = None
+                            duration = 0
+                            was_social = False
+                            off_start = None
+                            self.threshold_triggered = False
+                            state = "FOCUSED"
+                        elif start:
+                            duration = now - start
+                            state = "GRACE-PERIOD (Persisted)"
                     else:
-                        if self.was_on_social_media:
-                            if self.off_social_start_time is None:
-                                self.off_social_start_time = now
-                            
-                            # Reduced grace period from 10s to 5s
-                            if now - self.off_social_start_time > 5:
-                                self.social_media_start_time = None
-                                self.continuous_social_duration = 0
-                                self.was_on_social_media = False
-                                self.threshold_triggered = False
-                                self.off_social_start_time = None
-                                self.last_state = "FOCUSED"
-                            else:
-                                if self.social_media_start_time:
-                                    self.continuous_social_duration = now - self.social_media_start_time
-                                    self.last_state = "GRACE-PERIOD (Persisted)"
-                        else:
-                            self.last_state = "FOCUSED"
+                        state = "FOCUSED"
+
+                    self.social_media_start_time = start
+                    self.off_social_start_time = off_start
+                    self.was_on_social_media = was_social
+                    self.continuous_social_duration = duration
+                    self.last_state = state
 
                     # Stable session state (Effective state)
-                    is_effectively_on_social = self.was_on_social_media
+                    is_effectively_on_social = was_social
 
-                    self.current_data = {
+                    new_data = {
                         "app": app,
                         "title": title,
                         "is_social": is_effectively_on_social,
                         "immediate_is_social": is_on_social,
-                        "continuous_minutes": round(self.continuous_social_duration / 60, 2)
+                        "continuous_minutes": round(duration / 60, 2),
+                        "scrolls_per_min": scrolls_per_min,
+                        "keys_per_min": keys_per_min
                     }
+                    data_changed = new_data != self.current_data
+                    self.current_data = new_data
+
+                # Push updates to listeners only when something changed
+                if data_changed:
+                    for listener in list(self._data_listeners):
+                        listener(new_data)
 
                 # Trigger callbacks based on stable session state
+                near_threshold = False
                 if is_effectively_on_social:
                     if not self.threshold_triggered:
-                        minutes = self.continuous_social_duration / 60
-                        if minutes >= SCROLL_DETECTION_THRESHOLD_MINUTES:
+                        near_threshold = duration > self._near_threshold_secs
+                        if duration >= self._threshold_secs:
+                            minutes = duration / 60
                             print(f"[Monitor] THRESHOLD HIT: {minutes:.2f} mins. Triggering nudge...")
                             self.threshold_triggered = True
                             if self.on_threshold_exceeded:
@@ -249,8 +526,9 @@ class ActivityMonitor:
 
                 # Debug output (Every 2 seconds)
                 if now - last_debug_time > 2.0:
-                    state_lbl = getattr(self, 'last_state', 'FOCUSED')
-                    print(f"[Monitor] {state_lbl:25} | {app:15} | {title[:25]}... | {self.continuous_social_duration:.1f}s")
+                    state_lbl = self.last_state
+                    log.debug("%-25s | %-15s | %s... | %.1fs",
+                              state_lbl, app, title[:25], self.continuous_social_duration)
                     last_debug_time = now
 
             except Exception as e:
@@ -258,5 +536,5 @@ class ActivityMonitor:
                 time.sleep(1.0)
                 continue
 
-            time.sleep(0.5)
+            time.sleep(self._poll_interval(now, near_threshold))
 
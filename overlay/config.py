@@ -82,6 +82,20 @@ BROWSER_PROCESSES = [
     "vivaldi.exe",
 ]
 
+# Title fragments that indicate an endless feed inside a browser
+FEED_TITLE_PATTERNS = ["reels", "shorts", "explore", "trending", "feed", "timeline"]
+
+# Lowercased lookup forms of the lists above, built once at import
+SOCIAL_MEDIA_APPS_LC = tuple(s.lower() for s in SOCIAL_MEDIA_APPS)
+SOCIAL_MEDIA_KEYWORDS_LC = tuple(k.lower() for k in SOCIAL_MEDIA_KEYWORDS)
+BROWSER_PROCESSES_LC = frozenset(b.lower() for b in BROWSER_PROCESSES)
+FEED_TITLE_PATTERNS_LC = tuple(p.lower() for p in FEED_TITLE_PATTERNS)
+
+# Entries with an extension ("app.exe") name one executable exactly; bare
+# names match anywhere in the process name
+SOCIAL_MEDIA_APPS_EXACT = frozenset(a for a in SOCIAL_MEDIA_APPS_LC if "." in a)
+SOCIAL_MEDIA_APPS_SUBSTR = tuple(a for a in SOCIAL_MEDIA_APPS_LC if "." not in a)
+
 
 # =============================================================================
 # Backend Integration
@@ -93,6 +107,9 @@ BACKEND_URL = "http://127.0.0.1:8000"
 # Lesson completion check endpoint
 LESSON_PROGRESS_ENDPOINT = "/api/lessons/progress"
 
+# Completed-lesson count across all topics, in one request
+LESSON_SUMMARY_ENDPOINT = "/api/lessons/progress-summary"
+
 
 # =============================================================================
 # Negotiation Messages
@@ -122,15 +139,35 @@ MESSAGES = {
 CONFIG_FILE = Path(__file__).parent / "scroll_monitor_settings.json"
 
 
+# Parsed CONFIG_FILE, keyed by its (mtime, size) so edits are picked up
+_user_config_cache: dict = {}
+_user_config_stamp = None
+
+
+def _cached_user_config() -> dict:
+    """Parsed user settings, re-read only when CONFIG_FILE changes on disk."""
+    global _user_config_cache, _user_config_stamp
+    try:
+        st = CONFIG_FILE.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = None
+
+    if stamp != _user_config_stamp:
+        config = {}
+        if stamp is not None:
+            try:
+                with open(CONFIG_FILE, "r") as f:
+                    config = json.load(f)
+            except Exception:
+                pass
+        _user_config_cache, _user_config_stamp = config, stamp
+    return _user_config_cache
+
+
 def load_user_config() -> dict:
     """Load user-customized settings if they exist."""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
+    return dict(_cached_user_config())
 
 
 def save_user_config(settings: dict):
@@ -144,7 +181,7 @@ def save_user_config(settings: dict):
 
 def get_config_value(key: str, default=None):
     """Get a config value, preferring user settings over defaults."""
-    user_config = load_user_config()
+    user_config = _cached_user_config()
     if key in user_config:
         return user_config[key]
     return globals().get(key, default)
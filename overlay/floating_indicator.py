@@ -9,8 +9,8 @@ A small, always-on-top floating circle with "R" logo that:
 
 import sys
 from PyQt6.QtWidgets import QWidget, QApplication, QLabel, QVBoxLayout
-from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal
-from PyQt6.QtGui import QPainter, QBrush, QColor, QPen, QFont
+from PyQt6.QtCore import Qt, QTimer, QPoint, QRect, pyqtSignal
+from PyQt6.QtGui import QPainter, QBrush, QColor, QPen, QFont, QPixmap
 
 
 class FloatingIndicator(QWidget):
@@ -23,6 +23,9 @@ class FloatingIndicator(QWidget):
     
     clicked = pyqtSignal()
     
+    # Diameter of the indicator window (px)
+    SIZE = 60
+    
     def __init__(self):
         super().__init__()
         
@@ -30,9 +33,30 @@ class FloatingIndicator(QWidget):
         self.social_minutes = 0.0
         self.drag_pos = QPoint()
         self.press_pos = QPoint()
+        self._last_total_sec = -1
         
+        self._init_paint_cache()
         self._init_ui()
         
+    def _init_paint_cache(self):
+        """Build the pens, brushes, font and geometry paintEvent reuses."""
+        self._brush_social = QBrush(QColor(220, 50, 50))
+        self._brush_focus = QBrush(QColor(50, 180, 80))
+        self._pen_social_border = QPen(QColor(180, 30, 30), 2)
+        self._pen_focus_border = QPen(QColor(30, 140, 60), 2)
+        self._shadow_brush = QBrush(QColor(0, 0, 0, 50))
+        self._white_pen = QPen(QColor(255, 255, 255))
+        self._r_font = QFont("Segoe UI", 22, QFont.Weight.Bold)
+        
+        self._shadow_rect = QRect(4, 4, self.SIZE - 8, self.SIZE - 8)
+        self._circle_rect = QRect(2, 2, self.SIZE - 8, self.SIZE - 8)
+        self._text_rect = QRect(2, 2, self.SIZE - 8, self.SIZE - 12)
+        # Everything paintEvent draws, border pen included
+        self._paint_rect = self._shadow_rect.united(self._circle_rect).adjusted(-1, -1, 1, 1)
+        
+        # Fully rendered indicator per (is_on_social, device pixel ratio)
+        self._pixmaps = {}
+        
     def _init_ui(self):
         """Initialize the UI."""
         # Window flags: Frameless, Always on Top, Tool window, Stay on top
@@ -68,51 +92,69 @@ class FloatingIndicator(QWidget):
         
     def update_data(self, data):
         """Update the indicator state from external data."""
-        if data:
-            self.is_on_social = data.get("is_social", False)
-            self.social_minutes = data.get("continuous_minutes", 0.0)
-            
-            if self.is_on_social:
-                mins = int(self.social_minutes)
-                secs = int((self.social_minutes - mins) * 60)
-                self.time_label.setText(f"{mins}:{secs:02d}")
-            else:
-                self.time_label.setText("")
-                
-        self.update()  # Trigger repaint
+        if not data:
+            return
+        
+        is_on_social = data.get("is_social", False)
+        self.social_minutes = data.get("continuous_minutes", 0.0)
+        
+        # Whole seconds shown in the label (-1: label empty); only a new
+        # value is formatted and pushed to the label, which repaints itself
+        total_sec = int(self.social_minutes * 60) if is_on_social else -1
+        if total_sec != self._last_total_sec:
+            self._last_total_sec = total_sec
+            self.time_label.setText(f"{total_sec // 60}:{total_sec % 60:02d}" if total_sec >= 0 else "")
+        
+        # The circle only needs repainting when its color flips
+        if is_on_social != self.is_on_social:
+            self.is_on_social = is_on_social
+            self.update(self._paint_rect)
         
     def paintEvent(self, event):
         """Custom paint for the circular indicator."""
+        if not event.region().intersects(self._paint_rect):
+            return
+        
+        dpr = self.devicePixelRatioF()
+        key = (self.is_on_social, dpr)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            pixmap = self._pixmaps[key] = self._render_indicator(self.is_on_social, dpr)
+        
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        
+    def _render_indicator(self, is_on_social: bool, dpr: float) -> QPixmap:
+        """Draw the shadow, circle and "R" for one state into a pixmap."""
+        pixmap = QPixmap(int(self.SIZE * dpr), int(self.SIZE * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Choose color based on state
-        if self.is_on_social:
-            # Red gradient for social media
-            color = QColor(220, 50, 50)
-            border_color = QColor(180, 30, 30)
+        # Choose color based on state: red for social media, green for focused
+        if is_on_social:
+            brush, border_pen = self._brush_social, self._pen_social_border
         else:
-            # Green gradient for focused
-            color = QColor(50, 180, 80)
-            border_color = QColor(30, 140, 60)
+            brush, border_pen = self._brush_focus, self._pen_focus_border
         
         # Draw shadow
-        shadow_color = QColor(0, 0, 0, 50)
-        painter.setBrush(QBrush(shadow_color))
+        painter.setBrush(self._shadow_brush)
         painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(4, 4, self.SIZE - 8, self.SIZE - 8)
+        painter.drawEllipse(self._shadow_rect)
         
         # Draw main circle
-        painter.setBrush(QBrush(color))
-        painter.setPen(QPen(border_color, 2))
-        painter.drawEllipse(2, 2, self.SIZE - 8, self.SIZE - 8)
+        painter.setBrush(brush)
+        painter.setPen(border_pen)
+        painter.drawEllipse(self._circle_rect)
         
         # Draw "R" letter
-        painter.setPen(QPen(QColor(255, 255, 255)))
-        font = QFont("Segoe UI", 22, QFont.Weight.Bold)
-        painter.setFont(font)
-        painter.drawText(2, 2, self.SIZE - 8, self.SIZE - 12, 
-                        Qt.AlignmentFlag.AlignCenter, "R")
+        painter.setPen(self._white_pen)
+        painter.setFont(self._r_font)
+        painter.drawText(self._text_rect, Qt.AlignmentFlag.AlignCenter, "R")
+        painter.end()
+        return pixmap
         
     def mousePressEvent(self, event):
         """Handle mouse press for dragging."""
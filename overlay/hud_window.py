@@ -1,21 +1,27 @@
 import sys
-import psutil
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QApplication
-from PyQt6.QtCore import Qt, QTimer, QPoint
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QApplication
+from PyQt6.QtCore import Qt, QPoint, pyqtSignal
 from PyQt6.QtGui import QColor, QPalette, QFont
-from activity_monitor import ActivityMonitor
+from monitor_singleton import get_monitor, release_monitor
 from win_utils import set_click_through, force_always_on_top
 
 class HUDWindow(QWidget):
+    # Carries monitor updates from its worker thread to the GUI thread
+    stats_changed = pyqtSignal(dict)
+
     def __init__(self):
         super().__init__()
 
-        self.monitor = ActivityMonitor()
-        self.monitor.start()
-
         self.drag_pos = QPoint()
         self.init_ui()
 
+        # Event-driven: repaint only when the monitor reports a change
+        self.stats_changed.connect(self.update_stats)
+        self.monitor = get_monitor()
+        self._on_monitor_data = self.stats_changed.emit
+        self.monitor.add_data_listener(self._on_monitor_data)
+        self.monitor.start()
+
     def init_ui(self):
         # Window flags: Frameless, Always on Top, Tool window (no taskbar icon)
         self.setWindowFlags(
@@ -45,17 +51,34 @@ class HUDWindow(QWidget):
         self.title_label.setObjectName("title")
 
         self.status_label = QLabel("Status: —")
-        self.confidence_label = QLabel("Confidence: —")
+        # Minutes sit in their own label so the emoji status text is only
+        # re-shaped when the state flips
+        self.mins_label = QLabel("")
+        self.activity_label = QLabel("Activity: —")
 
         self.container_layout.addWidget(self.title_label)
         layout.addWidget(self.container)
 
-        self.container_layout.addWidget(self.status_label)
-        self.container_layout.addWidget(self.confidence_label)
+        status_row = QHBoxLayout()
+        status_row.addWidget(self.status_label)
+        status_row.addWidget(self.mins_label)
+        status_row.addStretch()
+        self.container_layout.addLayout(status_row)
+        self.container_layout.addWidget(self.activity_label)
 
-        for label in (self.status_label, self.confidence_label):
+        for label in (self.status_label, self.activity_label):
             label.setStyleSheet("color: white; font-size: 12px;")
 
+        # Status text and color per state; applied only when the state flips
+        self._text_social = "🚨 Social Media"
+        self._text_focus = "✅ Focused"
+        self._style_social = "color: #ff5555; font-size: 12px;"
+        self._style_focus = "color: #55ff88; font-size: 12px;"
+        self.mins_label.setStyleSheet(self._style_social)
+        self._was_social = None
+        self._last_mins = None
+        self._last_rates = None
+
         self.setStyleSheet("""
             #container {
                 background-color: rgba(20, 20, 30, 200);
@@ -71,27 +94,30 @@ class HUDWindow(QWidget):
             }
         """)
 
-        # Timer for updates
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_stats)
-        self.timer.start(1000)
-
-    def update_stats(self):
-        data = self.monitor.current_data
+    def update_stats(self, data):
         if not data:
             return
 
-        if data["is_social"]:
-            mins = data.get("continuous_minutes", 0)
-            self.status_label.setText(f"🚨 Social Media ({mins:.1f}m)")
-            self.status_label.setStyleSheet("color: #ff5555;")
-        else:
-            self.status_label.setText("✅ Focused")
-            self.status_label.setStyleSheet("color: #55ff88;")
-
-        self.confidence_label.setText(
-            f"Confidence: {int(data['confidence'] * 100)}%"
-        )
+        is_social = data["is_social"]
+        if is_social != self._was_social:
+            self._was_social = is_social
+            if is_social:
+                self.status_label.setText(self._text_social)
+                self.status_label.setStyleSheet(self._style_social)
+            else:
+                self.status_label.setText(self._text_focus)
+                self.status_label.setStyleSheet(self._style_focus)
+
+        # Minutes at their displayed precision; only a new value is set
+        mins = round(data.get("continuous_minutes", 0), 1) if is_social else None
+        if mins != self._last_mins:
+            self._last_mins = mins
+            self.mins_label.setText(f"({mins:.1f}m)" if mins is not None else "")
+
+        rates = (data.get("scrolls_per_min"), data.get("keys_per_min"))
+        if rates != self._last_rates and None not in rates:
+            self._last_rates = rates
+            self.activity_label.setText(f"Scroll: {rates[0]}/min · Keys: {rates[1]}/min")
 
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
@@ -107,3 +133,8 @@ class HUDWindow(QWidget):
         super().showEvent(event)
         # Click-through is disabled to allow dragging
         # set_click_through(int(self.winId()))
+
+    def closeEvent(self, event):
+        self.monitor.remove_data_listener(self._on_monitor_data)
+        release_monitor()
+        super().closeEvent(event)
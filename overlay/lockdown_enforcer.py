@@ -8,28 +8,83 @@ Enforces social media lockdown by:
 4. Monitoring for lesson completion to lift lockdown
 """
 
+import ctypes
 import os
 import sys
 import time
 import threading
 import subprocess
-import requests
-import psutil
-import win32gui
-import win32con
-import win32process
-from typing import Optional, Callable, List
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import wintypes
+from functools import lru_cache
+from typing import Optional, Callable, Dict, List
 from pathlib import Path
 
+# psutil, pywin32 and requests are imported where they are used: most
+# sessions never activate a lockdown, and requests alone pulls in urllib3
+# and charset_normalizer
+
 try:
     from .config import (
-        SOCIAL_MEDIA_APPS, SOCIAL_MEDIA_KEYWORDS, BROWSER_PROCESSES,
-        BACKEND_URL, LESSON_COMPLETION_POLL_INTERVAL
+        SOCIAL_MEDIA_APPS_EXACT, SOCIAL_MEDIA_APPS_SUBSTR,
+        SOCIAL_MEDIA_KEYWORDS_LC, BROWSER_PROCESSES_LC,
+        BACKEND_URL, LESSON_COMPLETION_POLL_INTERVAL,
+        LESSON_PROGRESS_ENDPOINT, LESSON_SUMMARY_ENDPOINT
     )
 except ImportError:
     from config import (
-        SOCIAL_MEDIA_APPS, SOCIAL_MEDIA_KEYWORDS, BROWSER_PROCESSES,
-        BACKEND_URL, LESSON_COMPLETION_POLL_INTERVAL
+        SOCIAL_MEDIA_APPS_EXACT, SOCIAL_MEDIA_APPS_SUBSTR,
+        SOCIAL_MEDIA_KEYWORDS_LC, BROWSER_PROCESSES_LC,
+        BACKEND_URL, LESSON_COMPLETION_POLL_INTERVAL,
+        LESSON_PROGRESS_ENDPOINT, LESSON_SUMMARY_ENDPOINT
+    )
+
+
+# Window events the lockdown reacts to: focus changes and title changes
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_NAMECHANGE = 0x800C
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+CHILDID_SELF = 0
+WM_QUIT = 0x0012
+
+# Full process/window sweep interval (seconds): a slow safety net while the
+# window event hook is live, the only enforcement when it is not
+SWEEP_INTERVAL_HOOKED = 15
+SWEEP_INTERVAL_POLLING = 2
+
+# Concurrent per-topic progress requests against backends without the
+# summary endpoint (also the session's connection pool size)
+PER_TOPIC_WORKERS = 8
+
+_WinEventProc = ctypes.WINFUNCTYPE(
+    None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+    wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+)
+_user32 = ctypes.WinDLL("user32")
+_user32.SetWinEventHook.restype = wintypes.HANDLE
+_user32.SetWinEventHook.argtypes = (
+    wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _WinEventProc,
+    wintypes.DWORD, wintypes.DWORD, wintypes.DWORD
+)
+_user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+_user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+_user32.TranslateMessage.argtypes = (ctypes.POINTER(wintypes.MSG),)
+_user32.DispatchMessageW.argtypes = (ctypes.POINTER(wintypes.MSG),)
+_user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+_kernel32 = ctypes.WinDLL("kernel32")
+
+
+@lru_cache(maxsize=512)
+def _is_social_app(proc_name: str) -> bool:
+    """
+    Whether a lowercase process name is a social media app.
+
+    Memoized: a scan sees the same few dozen names over and over
+    (one per browser/helper process).
+    """
+    return proc_name in SOCIAL_MEDIA_APPS_EXACT or any(
+        app in proc_name for app in SOCIAL_MEDIA_APPS_SUBSTR
     )
 
 
@@ -53,6 +108,13 @@ class LockdownEnforcer:
         self.initial_completed_lessons: int = 0
         self.current_topic: Optional[str] = None
         self._stop_event = threading.Event()
+        # Keep-alive connection to the local backend for completion polling,
+        # created on first poll
+        self._session = None
+        # Window event hook thread (id for posting WM_QUIT) and its callback,
+        # which must stay referenced while the hook is installed
+        self._hook_thread_id: Optional[int] = None
+        self._win_event_proc = _WinEventProc(self._on_win_event)
         
     def activate(self, topic: str = None):
         """
@@ -105,60 +167,84 @@ class LockdownEnforcer:
         self.is_active = False
         self._stop_event.set()
         
+        # Drop the pooled backend connections until the next lockdown
+        session, self._session = self._session, None
+        if session is not None:
+            session.close()
+        
         if self.on_lockdown_lifted:
             self.on_lockdown_lifted()
             
     def _close_social_media(self):
         """Close all social media applications and browser tabs."""
+        import psutil
+        
         closed_apps = []
+        # One process-table walk per pass, shared with the window scan
+        pid_to_name = {}
         
         # Find and terminate social media processes
         for proc in psutil.process_iter(['pid', 'name']):
             try:
-                proc_name = proc.info['name'].lower()
+                proc_name = (proc.info['name'] or "").lower()
+                pid_to_name[proc.info['pid']] = proc_name
                 
                 # Check if it's a social media app
-                for app in SOCIAL_MEDIA_APPS:
-                    if app.lower() in proc_name:
-                        print(f"[Lockdown] Closing social media app: {proc_name}")
-                        proc.terminate()
-                        closed_apps.append(proc_name)
-                        break
+                if _is_social_app(proc_name):
+                    print(f"[Lockdown] Closing social media app: {proc_name}")
+                    proc.terminate()
+                    closed_apps.append(proc_name)
                         
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
         
         # Find browser windows with social media
-        self._close_social_media_browser_windows()
+        self._close_social_media_browser_windows(pid_to_name)
         
         return closed_apps
         
-    def _close_social_media_browser_windows(self):
-        """Close browser windows that have social media in the title."""
+    def _close_social_media_browser_windows(self, pid_to_name: Optional[Dict[int, str]] = None):
+        """
+        Close browser windows that have social media in the title.
+        
+        Args:
+            pid_to_name: Lowercase process names by pid from the caller's
+                process scan; built here if not given.
+        """
+        import psutil
+        import win32con
+        import win32gui
+        import win32process
+        
+        if pid_to_name is None:
+            pid_to_name = {
+                p.info['pid']: (p.info['name'] or "").lower()
+                for p in psutil.process_iter(['pid', 'name'])
+            }
+        # Nothing to sweep unless a browser is running
+        browser_pids = {pid for pid, name in pid_to_name.items() if name in BROWSER_PROCESSES_LC}
+        if not browser_pids:
+            return
         windows_to_close = []
         
         def enum_windows_callback(hwnd, _):
-            """Callback for EnumWindows."""
-            if not win32gui.IsWindowVisible(hwnd):
-                return True
-                
+            """Callback for EnumWindows; cheapest rejections first."""
             try:
                 _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                proc_name = psutil.Process(pid).name().lower()
                 
-                # Only check browsers
-                if proc_name not in [p.lower() for p in BROWSER_PROCESSES]:
+                # Only check visible browser windows with a title
+                if pid not in browser_pids or not win32gui.IsWindowVisible(hwnd):
+                    return True
+                if not win32gui.GetWindowTextLength(hwnd):
                     return True
                     
                 title = win32gui.GetWindowText(hwnd).lower()
                 
                 # Check for social media keywords in title
-                for keyword in SOCIAL_MEDIA_KEYWORDS:
-                    if keyword.lower() in title:
-                        windows_to_close.append((hwnd, title, pid))
-                        break
+                if any(keyword in title for keyword in SOCIAL_MEDIA_KEYWORDS_LC):
+                    windows_to_close.append((hwnd, title, pid))
                         
-            except (psutil.NoSuchProcess, psutil.AccessDenied, Exception):
+            except Exception:
                 pass
                 
             return True
@@ -176,6 +262,9 @@ class LockdownEnforcer:
                 
     def _launch_resolut_app(self):
         """Launch or focus the Resolut app."""
+        import win32con
+        import win32gui
+        
         try:
             # First, try to find and focus the window if it exists
             hwnd = win32gui.FindWindow(None, 'Resolut Learning Assistant')
@@ -209,10 +298,85 @@ class LockdownEnforcer:
             
     def _enforcement_loop(self):
         """Continuously enforce lockdown by closing social media."""
+        hooked = self._start_window_hook()
+        interval = SWEEP_INTERVAL_HOOKED if hooked else SWEEP_INTERVAL_POLLING
+        if not hooked:
+            print("[Lockdown] Window event hook unavailable, polling instead")
+        
         while self.is_active and not self._stop_event.is_set():
             self._close_social_media()
-            # Check every 2 seconds
-            self._stop_event.wait(2)
+            self._stop_event.wait(interval)
+        
+        self._stop_window_hook()
+        
+    def _start_window_hook(self) -> bool:
+        """Start the window event hook thread; True once its hooks are installed."""
+        ready = threading.Event()
+        installed = []
+        threading.Thread(
+            target=self._window_hook_loop, args=(ready, installed), daemon=True
+        ).start()
+        ready.wait(5)
+        return bool(installed)
+        
+    def _stop_window_hook(self):
+        thread_id, self._hook_thread_id = self._hook_thread_id, None
+        if thread_id:
+            _user32.PostThreadMessageW(thread_id, WM_QUIT, 0, 0)
+            
+    def _window_hook_loop(self, ready: threading.Event, installed: list):
+        """Install the WinEvent hooks and pump messages until WM_QUIT."""
+        hooks = [
+            _user32.SetWinEventHook(event, event, None, self._win_event_proc,
+                                    0, 0, WINEVENT_OUTOFCONTEXT)
+            for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_NAMECHANGE)
+        ]
+        try:
+            if not all(hooks):
+                return
+            self._hook_thread_id = _kernel32.GetCurrentThreadId()
+            installed.append(True)
+            ready.set()
+            
+            msg = wintypes.MSG()
+            while _user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                _user32.TranslateMessage(ctypes.byref(msg))
+                _user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    _user32.UnhookWinEvent(hook)
+            ready.set()
+            
+    def _on_win_event(self, hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        """A window gained focus or changed title: check just that window."""
+        if not hwnd or id_object != OBJID_WINDOW or id_child != CHILDID_SELF:
+            return
+        if not self.is_active:
+            return
+        try:
+            import psutil
+            import win32con
+            import win32gui
+            import win32process
+            
+            if not win32gui.IsWindowVisible(hwnd):
+                return
+            _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            proc = psutil.Process(pid)
+            proc_name = proc.name().lower()
+            
+            if _is_social_app(proc_name):
+                print(f"[Lockdown] Closing social media app: {proc_name}")
+                proc.terminate()
+            elif proc_name in BROWSER_PROCESSES_LC:
+                title = win32gui.GetWindowText(hwnd).lower()
+                if any(keyword in title for keyword in SOCIAL_MEDIA_KEYWORDS_LC):
+                    print(f"[Lockdown] Closing browser window: {title[:50]}...")
+                    win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+        except Exception:
+            # Never let an exception escape into the ctypes callback
+            pass
             
     def _monitor_lesson_completion(self):
         """Monitor backend for lesson completion."""
@@ -230,46 +394,67 @@ class LockdownEnforcer:
                 
             self._stop_event.wait(LESSON_COMPLETION_POLL_INTERVAL)
             
+    def _http(self):
+        """The keep-alive session for backend polling."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            # One host; enough pooled connections for the per-topic fallback
+            session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=PER_TOPIC_WORKERS))
+            self._session = session
+        return self._session
+        
     def _get_completed_lesson_count(self) -> int:
         """Get the count of completed lessons from the backend."""
         try:
-            # Get all topics first
-            response = requests.get(f"{BACKEND_URL}/api/topics", timeout=5)
-            if response.status_code != 200:
+            response = self._http().get(f"{BACKEND_URL}{LESSON_SUMMARY_ENDPOINT}", timeout=5)
+            if response.status_code == 200:
+                return response.json().get("total_completed", 0)
+            if response.status_code != 404:
                 return 0
-                
-            topics = response.json().get("topics", [])
-            
-            total_completed = 0
-            for topic in topics:
-                try:
-                    prog_response = requests.get(
-                        f"{BACKEND_URL}/api/lessons/progress/{topic}",
-                        timeout=5
-                    )
-                    if prog_response.status_code == 200:
-                        progress = prog_response.json()
-                        completed = progress.get("completed_lessons", [])
-                        total_completed += len(completed)
-                except Exception:
-                    continue
-                    
-            return total_completed
+            # Backend predates the summary endpoint: sum per topic
+            return self._count_completed_per_topic()
             
         except Exception as e:
             print(f"[Lockdown] Error fetching lesson count: {e}")
             return 0
             
+    def _count_completed_per_topic(self) -> int:
+        """Sum completed lessons topic by topic, fetching topics concurrently."""
+        response = self._http().get(f"{BACKEND_URL}/api/topics", timeout=5)
+        if response.status_code != 200:
+            return 0
+            
+        topics = response.json().get("topics", [])
+        
+        def completed_in(topic: str) -> int:
+            try:
+                prog_response = self._http().get(
+                    f"{BACKEND_URL}{LESSON_PROGRESS_ENDPOINT}/{topic}",
+                    timeout=5
+                )
+                if prog_response.status_code == 200:
+                    return len(prog_response.json().get("completed_lessons", []))
+            except Exception:
+                pass
+            return 0
+        
+        if not topics:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(PER_TOPIC_WORKERS, len(topics))) as pool:
+            return sum(pool.map(completed_in, topics))
+            
     def get_blocked_apps(self) -> List[str]:
         """Get a list of currently blocked app names."""
+        import psutil
+        
         blocked = []
         for proc in psutil.process_iter(['name']):
             try:
                 proc_name = proc.info['name'].lower()
-                for app in SOCIAL_MEDIA_APPS:
-                    if app.lower() in proc_name:
-                        if proc_name not in blocked:
-                            blocked.append(proc_name)
+                if _is_social_app(proc_name) and proc_name not in blocked:
+                    blocked.append(proc_name)
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
         return blocked
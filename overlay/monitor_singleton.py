@@ -0,0 +1,36 @@
+"""
+Process-wide ActivityMonitor
+
+Overlays share one monitor (one polling thread, one set of input hooks)
+instead of each constructing their own.
+"""
+
+import threading
+
+from activity_monitor import ActivityMonitor
+
+_monitor = None
+_refs = 0
+_lock = threading.Lock()
+
+
+def get_monitor() -> ActivityMonitor:
+    """Return the shared monitor, creating it on first use; call start() to run it."""
+    global _monitor, _refs
+    with _lock:
+        if _monitor is None:
+            _monitor = ActivityMonitor()
+        _refs += 1
+        return _monitor
+
+
+def release_monitor():
+    """Drop one reference from get_monitor(); the last one stops the monitor."""
+    global _monitor, _refs
+    with _lock:
+        if _refs == 0:
+            return
+        _refs -= 1
+        if _refs == 0 and _monitor is not None:
+            _monitor.stop()
+            _monitor = None
@@ -10,7 +10,10 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QApplication, QGraphicsDropShadowEffect
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QPropertyAnimation, QEasingCurve, QPoint
+from PyQt6.QtCore import (
+    Qt, QTimer, pyqtSignal, QPropertyAnimation, QParallelAnimationGroup,
+    QEasingCurve, QPoint
+)
 from PyQt6.QtGui import QFont, QColor
 
 try:
@@ -25,6 +28,106 @@ except ImportError:
     )
 
 
+# Per-stage (icon, title, body, accept text, decline text or None), resolved
+# once at import; only bodies containing "{minutes}" are formatted per show
+_STAGE_TABLE = {
+    1: ("👋", MESSAGES["stage1_title"], MESSAGES["stage1_body"],
+        MESSAGES["stage1_accept"], MESSAGES["stage1_decline"]),
+    2: ("⏰", MESSAGES["stage2_title"], MESSAGES["stage2_body"],
+        MESSAGES["stage2_accept"], MESSAGES["stage2_decline"]),
+    3: ("📚", MESSAGES["stage3_title"], MESSAGES["stage3_body"],
+        MESSAGES["stage3_button"], None),
+}
+
+
+# Popup styles, installed once on the application rather than parsed per
+# widget. Selectors are scoped by class so they cannot leak elsewhere.
+_NEGOTIATION_QSS = """
+NegotiationOverlay #container {
+    background: qlineargradient(
+        x1:0, y1:0, x2:1, y2:1,
+        stop:0 rgba(25, 25, 40, 200),
+        stop:1 rgba(40, 40, 60, 200)
+    );
+    border: 1px solid rgba(100, 180, 255, 0.3);
+    border-radius: 24px;
+}
+NegotiationOverlay #title {
+    color: #ffffff;
+    font-family: 'Outfit', 'Segoe UI', sans-serif;
+    font-size: 24px;
+    font-weight: 800;
+    letter-spacing: -0.5px;
+}
+NegotiationOverlay #body {
+    color: rgba(255, 255, 255, 0.7);
+    font-family: 'Inter', 'Segoe UI', sans-serif;
+    font-size: 15px;
+    line-height: 1.5;
+}
+NegotiationOverlay #acceptBtn {
+    background: #00BAFF;
+    color: white;
+    border: none;
+    border-radius: 14px;
+    padding: 14px 24px;
+    font-size: 15px;
+    font-weight: bold;
+    min-width: 140px;
+}
+NegotiationOverlay #acceptBtn:hover {
+    background: #33C7FF;
+}
+NegotiationOverlay #declineBtn {
+    background: rgba(255, 255, 255, 0.05);
+    color: rgba(255, 255, 255, 0.6);
+    border: 1px solid rgba(255, 255, 255, 0.1);
+    border-radius: 14px;
+    padding: 14px 24px;
+    font-size: 14px;
+    min-width: 140px;
+}
+NegotiationOverlay #declineBtn:hover {
+    background: rgba(255, 255, 255, 0.1);
+    color: white;
+}
+NegotiationOverlay #progressBar {
+    background: rgba(255, 255, 255, 0.05);
+    border-radius: 2px;
+    height: 4px;
+}
+NegotiationOverlay #progressIndicator {
+    background: #00BAFF;
+    border-radius: 2px;
+}
+"""
+
+_TOAST_QSS = """
+ToastNotification #toastContainer {
+    background: rgba(40, 40, 50, 220);
+    border: 1px solid rgba(100, 180, 255, 0.4);
+    border-radius: 15px;
+}
+ToastNotification #toastLabel {
+    color: white;
+    font-family: 'Inter', sans-serif;
+    font-size: 13px;
+}
+"""
+
+_stylesheet_installed = False
+
+
+def _install_stylesheet():
+    """Append the popup styles to the application stylesheet (once)."""
+    global _stylesheet_installed
+    if _stylesheet_installed:
+        return
+    app = QApplication.instance()
+    app.setStyleSheet(app.styleSheet() + _NEGOTIATION_QSS + _TOAST_QSS)
+    _stylesheet_installed = True
+
+
 class NegotiationOverlay(QWidget):
     """
     A center-screen popup that negotiates with the user about social media usage.
@@ -44,17 +147,41 @@ class NegotiationOverlay(QWidget):
     declined = pyqtSignal()
     lockdown_triggered = pyqtSignal()
     
+    # Shared by every overlay; built on first use (needs a QApplication)
+    _EMOJI_FONT_36 = None
+    _SHADOW_COLOR = None
+    
+    # Process-wide overlay returned by instance()
+    _instance = None
+    
+    @classmethod
+    def instance(cls, parent=None):
+        """Return the shared overlay, building its UI on first use."""
+        if cls._instance is None:
+            cls._instance = cls(parent)
+        return cls._instance
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         self.current_stage = 0
-        self.negotiation_timer = None
+        self._next_stage = 0
         self.scroll_minutes = 0
         
+        # Delay before the next stage after a decline; reused across declines
+        self.negotiation_timer = QTimer(self)
+        self.negotiation_timer.setSingleShot(True)
+        self.negotiation_timer.timeout.connect(self._advance_stage)
+        
         self._init_ui()
         
     def _init_ui(self):
         """Initialize the UI components."""
+        cls = type(self)
+        if cls._EMOJI_FONT_36 is None:
+            cls._EMOJI_FONT_36 = QFont("Segoe UI Emoji", 36)
+            cls._SHADOW_COLOR = QColor(0, 0, 0, 100)
+        
         # Window flags: Frameless, Always on Top, bypassing taskbar
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
@@ -102,7 +229,7 @@ class NegotiationOverlay(QWidget):
         # Icon/Emoji label
         self.icon_label = QLabel("📱")
         self.icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.icon_label.setFont(QFont("Segoe UI Emoji", 36))
+        self.icon_label.setFont(cls._EMOJI_FONT_36)
         
         # Title
         self.title_label = QLabel()
@@ -141,74 +268,14 @@ class NegotiationOverlay(QWidget):
         container_layout.addLayout(buttons_layout)
         
         main_layout.addWidget(self.container)
+        _install_stylesheet()
         
         # Apply shadow effect
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(30)
-        shadow.setColor(QColor(0, 0, 0, 100))
+        shadow.setColor(cls._SHADOW_COLOR)
         shadow.setOffset(0, 10)
         self.container.setGraphicsEffect(shadow)
-        
-        # Apply stylesheet for Glassmorphism
-        self.setStyleSheet("""
-            #container {
-                background: qlineargradient(
-                    x1:0, y1:0, x2:1, y2:1,
-                    stop:0 rgba(25, 25, 40, 200),
-                    stop:1 rgba(40, 40, 60, 200)
-                );
-                border: 1px solid rgba(100, 180, 255, 0.3);
-                border-radius: 24px;
-            }
-            #title {
-                color: #ffffff;
-                font-family: 'Outfit', 'Segoe UI', sans-serif;
-                font-size: 24px;
-                font-weight: 800;
-                letter-spacing: -0.5px;
-            }
-            #body {
-                color: rgba(255, 255, 255, 0.7);
-                font-family: 'Inter', 'Segoe UI', sans-serif;
-                font-size: 15px;
-                line-height: 1.5;
-            }
-            #acceptBtn {
-                background: #00BAFF;
-                color: white;
-                border: none;
-                border-radius: 14px;
-                padding: 14px 24px;
-                font-size: 15px;
-                font-weight: bold;
-                min-width: 140px;
-            }
-            #acceptBtn:hover {
-                background: #33C7FF;
-            }
-            #declineBtn {
-                background: rgba(255, 255, 255, 0.05);
-                color: rgba(255, 255, 255, 0.6);
-                border: 1px solid rgba(255, 255, 255, 0.1);
-                border-radius: 14px;
-                padding: 14px 24px;
-                font-size: 14px;
-                min-width: 140px;
-            }
-            #declineBtn:hover {
-                background: rgba(255, 255, 255, 0.1);
-                color: white;
-            }
-            #progressBar {
-                background: rgba(255, 255, 255, 0.05);
-                border-radius: 2px;
-                height: 4px;
-            }
-            #progressIndicator {
-                background: #00BAFF;
-                border-radius: 2px;
-            }
-        """)
 
         # Entry Animation
         self.opacity_anim = QPropertyAnimation(self, b"windowOpacity")
@@ -221,6 +288,11 @@ class NegotiationOverlay(QWidget):
         self.pos_anim.setDuration(500)
         self.pos_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
         
+        # Fade and slide in together, on one animation timer
+        self.anim_group = QParallelAnimationGroup(self)
+        self.anim_group.addAnimation(self.opacity_anim)
+        self.anim_group.addAnimation(self.pos_anim)
+        
     def show_stage(self, stage: int, scroll_minutes: float = 0):
         """
         Show a specific negotiation stage.
@@ -232,58 +304,39 @@ class NegotiationOverlay(QWidget):
         self.current_stage = stage
         self.scroll_minutes = scroll_minutes
         
-        if stage == 1:
-            self.icon_label.setText("👋")
-            self.title_label.setText(MESSAGES["stage1_title"])
-            self.body_label.setText(
-                MESSAGES["stage1_body"].format(minutes=int(scroll_minutes))
-            )
-            self.accept_button.setText(MESSAGES["stage1_accept"])
-            self.decline_button.setText(MESSAGES["stage1_decline"])
-            self.decline_button.setVisible(True)
-            
-        elif stage == 2:
-            self.icon_label.setText("⏰")
-            self.title_label.setText(MESSAGES["stage2_title"])
-            self.body_label.setText(MESSAGES["stage2_body"])
-            self.accept_button.setText(MESSAGES["stage2_accept"])
-            self.decline_button.setText(MESSAGES["stage2_decline"])
-            self.decline_button.setVisible(True)
-            
-        elif stage == 3:
-            self.icon_label.setText("📚")
-            self.title_label.setText(MESSAGES["stage3_title"])
-            self.body_label.setText(MESSAGES["stage3_body"])
-            self.accept_button.setText(MESSAGES["stage3_button"])
-            self.decline_button.setVisible(False)
+        icon, title, body, accept, decline = _STAGE_TABLE[stage]
+        if "{minutes}" in body:
+            body = body.format(minutes=int(scroll_minutes))
+        
+        self.icon_label.setText(icon)
+        self.title_label.setText(title)
+        self.body_label.setText(body)
+        self.accept_button.setText(accept)
+        if decline is not None:
+            self.decline_button.setText(decline)
+        self.decline_button.setVisible(decline is not None)
         
         # Update progress bar
         progress_width = (POPUP_WIDTH - 100) * (stage / 3)
         self.progress_indicator.setFixedWidth(int(progress_width))
         
-        self._center_on_screen()
+        # Center on the primary screen
+        screen = QApplication.primaryScreen().geometry()
+        x = (screen.width() - self.width()) // 2
+        y = (screen.height() - self.height()) // 2
+        self.move(x, y)
         
         # Trigger Animations
-        screen = QApplication.primaryScreen().geometry()
-        center_y = (screen.height() - self.height()) // 2
-        self.pos_anim.setStartValue(self.pos() + QPoint(0, 50))
-        self.pos_anim.setEndValue(self.pos())
+        self.pos_anim.setStartValue(QPoint(x, y + 50))
+        self.pos_anim.setEndValue(QPoint(x, y))
         
         self.show()
         self.setWindowOpacity(1.0)
-        self.opacity_anim.start()
-        self.pos_anim.start()
+        self.anim_group.start()
         
         self.raise_()
         self.activateWindow()
         
-    def _center_on_screen(self):
-        """Center the popup on the primary screen."""
-        screen = QApplication.primaryScreen().geometry()
-        x = (screen.width() - self.width()) // 2
-        y = (screen.height() - self.height()) // 2
-        self.move(x, y)
-        
     def _on_accept(self):
         """Handle accept button click."""
         self.hide()
@@ -300,24 +353,22 @@ class NegotiationOverlay(QWidget):
         # Start timer for next stage
         if self.current_stage < 3:
             wait_ms = int(NEGOTIATION_WAIT_MINUTES * 60 * 1000)
-            self.negotiation_timer = QTimer()
-            self.negotiation_timer.setSingleShot(True)
-            self.negotiation_timer.timeout.connect(
-                lambda: self.show_stage(self.current_stage + 1, self.scroll_minutes)
-            )
+            self._next_stage = self.current_stage + 1
             self.negotiation_timer.start(wait_ms)
             
+    def _advance_stage(self):
+        """Show the stage after the one the user declined."""
+        self.show_stage(self._next_stage, self.scroll_minutes)
+        
     def trigger_lockdown(self):
         """Force trigger lockdown (called from stage 3)."""
         self.show_stage(3, self.scroll_minutes)
         self.lockdown_triggered.emit()
         
     def reset(self):
-        """Reset the negotiation state."""
+        """Reset the negotiation state, keeping the UI for the next session."""
         self.current_stage = 0
-        if self.negotiation_timer:
-            self.negotiation_timer.stop()
-            self.negotiation_timer = None
+        self.negotiation_timer.stop()
         self.hide()
 
 
@@ -325,10 +376,35 @@ class ToastNotification(QWidget):
     """
     A small, glassmorphic toast notification for gentle nudges.
     Appears at the top-right and fades out.
+    
+    Use show_message() to reuse a single hidden toast rather than building
+    a new widget tree for every nudge.
     """
     
+    # Shared by every toast; built on first use (needs a QApplication)
+    _EMOJI_FONT_20 = None
+    _SHADOW_COLOR = None
+    
+    # Toast reused by show_message()
+    _shared = None
+    
+    @classmethod
+    def show_message(cls, message):
+        """Show message in the shared toast, creating it on first use."""
+        if cls._shared is None:
+            cls._shared = cls(message)
+        else:
+            cls._shared.label.setText(message)
+        cls._shared.show_toast()
+        return cls._shared
+    
     def __init__(self, message, parent=None):
         super().__init__(parent)
+        cls = type(self)
+        if cls._EMOJI_FONT_20 is None:
+            cls._EMOJI_FONT_20 = QFont("Segoe UI Emoji", 20)
+            cls._SHADOW_COLOR = QColor(0, 0, 0, 80)
+        
         self.setWindowFlags(
             Qt.WindowType.WindowStaysOnTopHint |
             Qt.WindowType.FramelessWindowHint |
@@ -347,40 +423,47 @@ class ToastNotification(QWidget):
         container_layout.setContentsMargins(15, 10, 15, 10)
         
         self.icon = QLabel("💡")
-        self.icon.setFont(QFont("Segoe UI Emoji", 20))
+        self.icon.setFont(cls._EMOJI_FONT_20)
         
         self.label = QLabel(message)
+        self.label.setObjectName("toastLabel")
         self.label.setWordWrap(True)
-        self.label.setStyleSheet("color: white; font-family: 'Inter', sans-serif; font-size: 13px;")
         
         container_layout.addWidget(self.icon)
         container_layout.addWidget(self.label)
         layout.addWidget(self.container)
-        
-        self.setStyleSheet("""
-            #toastContainer {
-                background: rgba(40, 40, 50, 220);
-                border: 1px solid rgba(100, 180, 255, 0.4);
-                border-radius: 15px;
-            }
-        """)
+        _install_stylesheet()
         
         # Shadow
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(20)
-        shadow.setColor(QColor(0, 0, 0, 80))
+        shadow.setColor(cls._SHADOW_COLOR)
         self.container.setGraphicsEffect(shadow)
         
         # Animations
         self.opacity_anim = QPropertyAnimation(self, b"windowOpacity")
         self.opacity_anim.setDuration(500)
+        # The same animation fades in and out; only a fade-out hides
+        self._is_fading_out = False
+        self.opacity_anim.finished.connect(self._on_fade_finished)
         
         self.pos_anim = QPropertyAnimation(self, b"pos")
         self.pos_anim.setDuration(500)
         self.pos_anim.setEasingCurve(QEasingCurve.Type.OutCubic)
         
+        # Fade and slide in together, on one animation timer
+        self.anim_group = QParallelAnimationGroup(self)
+        self.anim_group.addAnimation(self.opacity_anim)
+        self.anim_group.addAnimation(self.pos_anim)
+        
+        # Starts the fade-out; restarted (not stacked) by every show
+        self._hide_timer = QTimer(self)
+        self._hide_timer.setSingleShot(True)
+        self._hide_timer.timeout.connect(self.fade_out)
+        
     def show_toast(self):
         """Show the toast at top-right."""
+        self._is_fading_out = False
         self.setWindowOpacity(0.0)
         screen = QApplication.primaryScreen().geometry()
         start_x = screen.width() - self.width() - 20
@@ -398,24 +481,32 @@ class ToastNotification(QWidget):
         self.raise_()
         self.activateWindow()
         
-        self.pos_anim.start()
-        self.opacity_anim.start()
+        self.anim_group.start()
         
         # Auto-hide after 5 seconds
-        QTimer.singleShot(5000, self.fade_out)
+        self._hide_timer.start(5000)
         
     def fade_out(self):
         self.opacity_anim.setStartValue(1.0)
         self.opacity_anim.setEndValue(0.0)
-        self.opacity_anim.finished.connect(self.close)
+        self._is_fading_out = True
+        # Fade alone; a grouped animation only runs by itself while its
+        # group is stopped
+        self.anim_group.stop()
         self.opacity_anim.start()
+        
+    def _on_fade_finished(self):
+        """Hide (not close) the faded-out toast so it can be shown again."""
+        if self._is_fading_out:
+            self._is_fading_out = False
+            self.hide()
 
 
 # Test the overlay if run directly
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
-    overlay = NegotiationOverlay()
+    overlay = NegotiationOverlay.instance()
     overlay.accepted.connect(lambda: print("User accepted!"))
     overlay.declined.connect(lambda: print("User declined!"))
     overlay.lockdown_triggered.connect(lambda: print("Lockdown triggered!"))
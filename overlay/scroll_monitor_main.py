@@ -23,7 +23,7 @@ from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal, Qt
 from PyQt6.QtGui import QIcon, QAction
 
-from activity_monitor import ActivityMonitor
+from monitor_singleton import get_monitor
 from negotiation_overlay import NegotiationOverlay, ToastNotification
 from floating_indicator import FloatingIndicator
 from lockdown_enforcer import LockdownEnforcer
@@ -34,7 +34,7 @@ from config import (
 
 class MonitorSignals(QObject):
     """Bridge for cross-thread communication from ActivityMonitor to PyQt UI."""
-    socialDetected = pyqtSignal(dict)
+    dataChanged = pyqtSignal(dict)
     thresholdExceeded = pyqtSignal(float)
 
 class ScrollMonitor:
@@ -50,8 +50,8 @@ class ScrollMonitor:
         self.signals = MonitorSignals()
         
         # Initialize components
-        self.monitor = ActivityMonitor()
-        self.overlay = NegotiationOverlay()
+        self.monitor = get_monitor()
+        self.overlay = NegotiationOverlay.instance()
         self.enforcer = LockdownEnforcer()
         self.indicator = FloatingIndicator()
         
@@ -67,7 +67,6 @@ class ScrollMonitor:
         # Status
         self.is_paused = False
         self.toast_shown = False
-        self.active_toasts = [] # Prevent garbage collection
         
         # Diagnostic heartbeat
         self.heartbeat_timer = QTimer()
@@ -80,12 +79,14 @@ class ScrollMonitor:
     def _setup_callbacks(self):
         """Connect all component signals and callbacks."""
         
-        # 1. Redirect monitor callbacks to emit signals (thread-safe bridge)
-        self.monitor.on_social_media_detected = self.signals.socialDetected.emit
+        # 1. Redirect monitor callbacks to emit signals (thread-safe bridge).
+        #    The monitor pushes its state only when it changes, so the UI
+        #    does no work on ticks where nothing happened.
+        self.monitor.add_data_listener(self.signals.dataChanged.emit)
         self.monitor.on_threshold_exceeded = self.signals.thresholdExceeded.emit
         
         # 2. Connect signals to main-thread handlers
-        self.signals.socialDetected.connect(self._handle_social_detected)
+        self.signals.dataChanged.connect(self._handle_data_changed)
         self.signals.thresholdExceeded.connect(self._handle_threshold_exceeded)
         
         # 3. Handle lockdown lifting
@@ -119,22 +120,25 @@ class ScrollMonitor:
         print("[ScrollMonitor] Indicator clicked - launching app")
         self.enforcer._launch_resolut_app()
 
-    def _handle_social_detected(self, data: dict):
-        """Handle signal from monitor thread about active social media (Main Thread)."""
-        # Update the floating R indicator
+    def _handle_data_changed(self, data: dict):
+        """Handle a monitor state change (Main Thread)."""
+        # Update the floating R indicator, in both directions
         self.indicator.update_data(data)
         
+        if data.get("is_social"):
+            self._handle_social_detected(data)
+
+    def _handle_social_detected(self, data: dict):
+        """Handle active social media (Main Thread)."""
         mins = data.get("continuous_minutes", 0)
         
         # Trigger toast at 0.5 minutes (30s)
         if mins >= 0.5 and not self.toast_shown:
             if mins < SCROLL_DETECTION_THRESHOLD_MINUTES:
                 print(f"[Main] Triggering nudge at {mins:.2f} minutes")
-                toast = ToastNotification(
+                ToastNotification.show_message(
                     f"You've been on {data.get('app', 'social media')} for 30 seconds. Ready to learn? 📚"
                 )
-                self.active_toasts.append(toast)
-                toast.show_toast()
                 self.toast_shown = True
         
         # Reset toast_shown only if duration is fully reset